@@ -0,0 +1,208 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import torch
+from cv2.typing import MatLike
+
+from plate_cli.batch import BatchProcessor, Decoded, decode_image, iter_images
+from plate_cli.models import Models
+from plate_cli.profiler import profiler
+
+
+def peak_rss_mb() -> float:
+    """Pico de memoria residente del proceso (en Linux ru_maxrss está en KB).
+    Es el máximo de toda la vida del proceso, por eso cada configuración corre
+    en uno propio."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def resize_longest(image: MatLike, size: int) -> MatLike:
+    height, width = image.shape[:2]
+    scale = size / max(width, height)
+    if scale == 1:
+        return image
+    return cv2.resize(
+        image,
+        (round(width * scale), round(height * scale)),
+        interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR,
+    )
+
+
+def load_models() -> Tuple[Models, Dict[str, float]]:
+    models = Models()
+
+    start = perf_counter()
+    models.load_yolo()
+    yolo_time = perf_counter() - start
+
+    start = perf_counter()
+    models.load_reader()
+    reader_time = perf_counter() - start
+
+    return models, {"yolo_s": round(yolo_time, 3), "reader_s": round(reader_time, 3)}
+
+
+def run_config(
+    images_dir: str,
+    resolution: int,
+    batch_size: int,
+    threads: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    """Mide una configuración desde cero: se ejecuta en un proceso nuevo para
+    que la memoria y los hilos de una no se mezclen con los de otra."""
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(threads)
+
+    images: List[Decoded] = [
+        (path, resize_longest(decode_image(path), resolution))
+        for path in iter_images(Path(images_dir))
+    ]
+
+    profiler.enable()
+    models, load_times = load_models()
+
+    processor = BatchProcessor(models, batch_size)
+    batches = [images[i : i + batch_size] for i in range(0, len(images), batch_size)]
+
+    # La primera pasada inicializa torch y reserva memoria: no se mide
+    processor.process_batch(batches[0])
+
+    profiler.reset()
+    start = perf_counter()
+    for _ in range(repeat):
+        for batch in batches:
+            processor.process_batch(batch)
+    elapsed = perf_counter() - start
+
+    processed = len(images) * repeat
+
+    return {
+        "images_per_sec": round(processed / elapsed, 3),
+        "elapsed_s": round(elapsed, 3),
+        "images": processed,
+        "model_load": load_times,
+        "stages": {
+            name: {
+                "count": count,
+                "p50_ms": round(p50, 3),
+                "p95_ms": round(p95, 3),
+                "p99_ms": round(p99, 3),
+            }
+            for name, count, _, p50, p95, p99 in profiler.summary()
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def benchmark(
+    images_dir: str,
+    batch_sizes: List[int],
+    threads: List[int],
+    resolutions: List[int],
+    repeat: int,
+) -> Dict[str, Any]:
+    paths = list(iter_images(Path(images_dir)))
+    if not paths:
+        raise FileNotFoundError("No se encontraron imágenes para el benchmark.")
+
+    runs: List[Dict[str, Any]] = []
+    for resolution in resolutions:
+        for thread_count in threads:
+            for batch_size in batch_sizes:
+                print(
+                    f"Resolución {resolution}, hilos {thread_count}, "
+                    f"lote {batch_size}..."
+                )
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as child:
+                    run = child.submit(
+                        run_config,
+                        images_dir,
+                        resolution,
+                        batch_size,
+                        thread_count,
+                        repeat,
+                    ).result()
+                run.update(
+                    {
+                        "resolution": resolution,
+                        "threads": thread_count,
+                        "batch_size": batch_size,
+                    }
+                )
+                runs.append(run)
+
+    try:
+        package_version = version("plate-cli")
+    except PackageNotFoundError:
+        package_version = None
+
+    return {
+        "version": package_version,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "torch": torch.__version__,
+        "cuda": torch.cuda.is_available(),
+        "dataset": {"path": images_dir, "images": len(paths)},
+        "runs": runs,
+    }
+
+
+def int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark reproducible de detección y OCR"
+    )
+    parser.add_argument(
+        "--images", type=str, default="tests/images", help="Carpeta de imágenes"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int_list, default=[1, 4, 8], help="Ej: 1,4,8"
+    )
+    parser.add_argument("--threads", type=int_list, default=[1, 4], help="Ej: 1,4")
+    parser.add_argument(
+        "--resolutions",
+        type=int_list,
+        default=[640, 1280],
+        help="Lado mayor de las imágenes en píxeles. Ej: 640,1280",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Pasadas sobre el conjunto"
+    )
+    parser.add_argument(
+        "--output", type=str, default="benchmark.json", help="Archivo JSON"
+    )
+
+    args = parser.parse_args()
+
+    report = benchmark(
+        args.images, args.batch_sizes, args.threads, args.resolutions, args.repeat
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for run in report["runs"]:
+        print(
+            f"{run['resolution']:>5}px  hilos {run['threads']:>2}  "
+            f"lote {run['batch_size']:>3}: {run['images_per_sec']:.2f} img/s"
+        )
+    print(f"Resultados guardados en {args.output}")
@@ -0,0 +1,175 @@
+import argparse
+import json
+from pathlib import Path
+from statistics import median, quantiles
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+from cv2.typing import MatLike
+
+from plate_cli.batch import decode_image, iter_images
+from plate_cli.detector import available_backends
+from plate_cli.models import Models
+
+# Backend y si usa el modelo cuantizado
+Variant = Tuple[str, bool]
+
+
+def variants(backends: List[str], int8: bool) -> List[Variant]:
+    result: List[Variant] = []
+    for backend in backends:
+        result.append((backend, False))
+        if int8 and backend != "torch":
+            result.append((backend, True))
+    return result
+
+
+def latency(
+    models: Models, images: List[MatLike], batch_size: int, repeat: int
+) -> Dict[str, float]:
+    batches = [images[i : i + batch_size] for i in range(0, len(images), batch_size)]
+
+    # ONNX Runtime y OpenVINO preparan el grafo en la primera inferencia
+    models.inference(batches[0])
+
+    times: List[float] = []
+    for _ in range(repeat):
+        for batch in batches:
+            start = perf_counter()
+            models.inference(batch)
+            times.append((perf_counter() - start) * 1000 / len(batch))
+
+    return {
+        "ms_per_image_p50": round(median(times), 3),
+        "ms_per_image_p95": round(quantiles(times, n=20)[-1], 3)
+        if len(times) > 1
+        else round(times[0], 3),
+    }
+
+
+def accuracy(models: Models, data: str, imgsz: int) -> Dict[str, float]:
+    """mAP sobre el conjunto de validación del YAML de ultralytics."""
+    yolo = models.yolo
+    if yolo is None:
+        raise RuntimeError("El modelo YOLO no ha sido cargado.")
+
+    metrics = yolo.val(data=data, imgsz=imgsz, verbose=False, plots=False)
+    return {
+        "map50": round(float(metrics.box.map50), 4),
+        "map50_95": round(float(metrics.box.map), 4),
+    }
+
+
+def benchmark(
+    images_dir: str,
+    data: str | None,
+    backends: List[str],
+    int8: bool,
+    calibration_data: Path | None,
+    batch_size: int,
+    imgsz: int,
+    repeat: int,
+) -> List[Dict[str, Any]]:
+    images = [decode_image(path) for path in iter_images(Path(images_dir))]
+    if not images:
+        raise FileNotFoundError("No se encontraron imágenes para el benchmark.")
+
+    reports: List[Dict[str, Any]] = []
+    for backend, quantized in variants(backends, int8):
+        if quantized and backend == "openvino" and calibration_data is None:
+            print("openvino int8 omitido: requiere --calibration-data")
+            continue
+        print(f"{backend}{' int8' if quantized else ''}...")
+        models = Models(
+            imgsz=imgsz,
+            detector_backend=backend,
+            int8=quantized,
+            calibration_data=calibration_data,
+        )
+
+        # La primera vez incluye la conversión de los pesos
+        start = perf_counter()
+        weights = models.detector_weights()
+        export_time = perf_counter() - start
+
+        start = perf_counter()
+        models.load_yolo()
+        load_time = perf_counter() - start
+
+        report: Dict[str, Any] = {
+            "backend": backend,
+            "int8": quantized,
+            "weights": str(weights),
+            "export_s": round(export_time, 3),
+            "load_s": round(load_time, 3),
+            **latency(models, images, batch_size, repeat),
+        }
+        if data is not None:
+            report.update(accuracy(models, data, imgsz))
+        reports.append(report)
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara mAP y latencia del detector entre backends"
+    )
+    parser.add_argument(
+        "--images", type=str, default="tests/images", help="Carpeta de imágenes"
+    )
+    parser.add_argument(
+        "--data",
+        type=str,
+        default=None,
+        help="YAML del conjunto de validación de ultralytics para medir mAP",
+    )
+    parser.add_argument(
+        "--backends",
+        type=lambda value: value.split(","),
+        default=available_backends(),
+        help="Ej: torch,onnx,openvino (por defecto, los instalados)",
+    )
+    parser.add_argument(
+        "--int8", action="store_true", help="Incluye las variantes cuantizadas"
+    )
+    parser.add_argument(
+        "--calibration-data",
+        type=Path,
+        default=None,
+        help="YAML para calibrar la cuantización de OpenVINO (sin él, se usa --data)",
+    )
+    parser.add_argument("--batch-size", type=int, default=8, help="Imágenes por lote")
+    parser.add_argument("--imgsz", type=int, default=640, help="Resolución de YOLO")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Pasadas sobre el conjunto"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Archivo JSON")
+
+    args = parser.parse_args()
+    if args.calibration_data is None and args.data is not None:
+        # El conjunto de validación ya son imágenes de matrículas
+        args.calibration_data = Path(args.data)
+
+    reports = benchmark(
+        args.images,
+        args.data,
+        args.backends,
+        args.int8,
+        args.calibration_data,
+        args.batch_size,
+        args.imgsz,
+        args.repeat,
+    )
+
+    for report in reports:
+        name = f"{report['backend']}{' int8' if report['int8'] else ''}"
+        print(
+            f"{name:>13}: {report['ms_per_image_p50']:.2f} ms/imagen (p50), "
+            f"{report['ms_per_image_p95']:.2f} ms (p95), "
+            f"mAP50 {report.get('map50')}, mAP50-95 {report.get('map50_95')}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
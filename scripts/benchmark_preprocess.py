@@ -0,0 +1,178 @@
+import argparse
+import csv
+import json
+from itertools import product
+from pathlib import Path
+from statistics import mean, median
+from time import perf_counter
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from plate_cli.batch import decode_image
+from plate_cli.constants import ACCEPTED_IMAGE_FORMATS, OCR_MODES, PREPROCESS_PROFILES
+from plate_cli.models import Models, crop_box
+from plate_cli.utils.preprocess_image import preprocess_image
+
+# Archivo de origen, país y recorte de la matrícula
+Crop = Tuple[str, str, NDArray[np.uint8]]
+
+
+def load_crops(models: Models, images_dir: str) -> List[Crop]:
+    """Detecta las matrículas una sola vez para comparar todos los perfiles
+    sobre los mismos recortes."""
+    crops: List[Crop] = []
+
+    for path in sorted(Path(images_dir).iterdir()):
+        if path.suffix not in ACCEPTED_IMAGE_FORMATS:
+            continue
+
+        image = decode_image(path)
+        result = models.inference(image)[0]
+        if not result.boxes:
+            continue
+
+        for box in result.boxes:
+            x_min, y_min, x_max, y_max = box.xyxy[0].tolist()
+            crop = crop_box(image, (x_min, y_min, x_max, y_max))
+            crops.append((path.name, result.names[int(box.cls.item())], crop))
+
+    return crops
+
+
+def load_labels(labels_path: str) -> Dict[str, Set[str]]:
+    """Lee un CSV `file,text`; varias matrículas de una imagen se separan con `|`."""
+    labels: Dict[str, Set[str]] = {}
+
+    with open(labels_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            labels[row["file"]] = {
+                text.replace(" ", "").upper() for text in row["text"].split("|")
+            }
+
+    return labels
+
+
+def benchmark_profile(
+    models: Models, crops: List[Crop], profile: str, ocr_mode: str, repeat: int
+) -> Dict[str, Any]:
+    preprocess_times: List[float] = []
+    for _ in range(repeat):
+        for _, country, crop in crops:
+            start = perf_counter()
+            preprocess_image(crop, country, profile)
+            preprocess_times.append((perf_counter() - start) * 1000)
+
+    models.preprocess_profile = profile
+    models.ocr_mode = ocr_mode
+    images = [crop for _, _, crop in crops]
+    countries = [country for _, country, _ in crops]
+
+    # La primera llamada de cada modo carga pesos y reserva memoria: no se mide
+    texts = models.read_texts(images, countries)
+
+    # read_texts también preprocesa: se descuenta lo medido arriba para que
+    # la latencia sea solo la del OCR
+    preprocess_per_crop = mean(preprocess_times)
+    ocr_times: List[float] = []
+    for _ in range(repeat):
+        start = perf_counter()
+        models.read_texts(images, countries)
+        elapsed = (perf_counter() - start) * 1000 / len(crops)
+        ocr_times.append(max(0.0, elapsed - preprocess_per_crop))
+
+    return {
+        "profile": profile,
+        "ocr_mode": ocr_mode,
+        "crops": len(crops),
+        "preprocess_ms_mean": round(mean(preprocess_times), 3),
+        "preprocess_ms_p50": round(median(preprocess_times), 3),
+        "ocr_ms_mean": round(mean(ocr_times), 3),
+        "ocr_ms_p50": round(median(ocr_times), 3),
+        "texts": texts,
+    }
+
+
+def accuracy(
+    crops: List[Crop], texts: List[str], labels: Dict[str, Set[str]]
+) -> float | None:
+    labeled = [
+        (file, text) for (file, _, _), text in zip(crops, texts) if file in labels
+    ]
+    if not labeled:
+        return None
+
+    hits = sum(text.replace(" ", "") in labels[file] for file, text in labeled)
+    return round(hits / len(labeled), 4)
+
+
+def benchmark(
+    images_dir: str, labels_path: str | None, repeat: int
+) -> List[Dict[str, Any]]:
+    models = Models()
+    models.load_yolo()
+    models.load_reader()
+
+    crops = load_crops(models, images_dir)
+    if not crops:
+        raise FileNotFoundError("No se detectaron matrículas en las imágenes.")
+
+    labels = load_labels(labels_path) if labels_path else {}
+    reports = [
+        benchmark_profile(models, crops, profile, ocr_mode, repeat)
+        for profile, ocr_mode in product(PREPROCESS_PROFILES, OCR_MODES)
+    ]
+
+    reference = reports[0]["texts"]
+    for report in reports:
+        report["accuracy"] = accuracy(crops, report["texts"], labels)
+        # Coincidencia con el perfil de referencia cuando no hay etiquetas
+        report["agreement"] = round(
+            sum(a == b for a, b in zip(report["texts"], reference)) / len(crops), 4
+        )
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara precisión y latencia de los perfiles de "
+        "preprocesamiento y los modos del OCR"
+    )
+    parser.add_argument(
+        "--images", type=str, default="tests/images", help="Carpeta de imágenes"
+    )
+    parser.add_argument(
+        "--labels",
+        type=str,
+        default=None,
+        help="CSV con columnas file,text (por defecto, labels.csv de --images)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Repeticiones del preprocesamiento y del OCR",
+    )
+    parser.add_argument("--output", type=str, default=None, help="Archivo JSON")
+
+    args = parser.parse_args()
+
+    labels_path = args.labels
+    if labels_path is None and (Path(args.images) / "labels.csv").exists():
+        labels_path = str(Path(args.images) / "labels.csv")
+
+    reports = benchmark(args.images, labels_path, args.repeat)
+
+    for report in reports:
+        print(
+            f"{report['profile']:>8} / {report['ocr_mode']:<9}: "
+            f"preprocesamiento {report['preprocess_ms_p50']:.2f} ms (p50), "
+            f"OCR {report['ocr_ms_p50']:.2f} ms/recorte (p50), "
+            f"precisión {report['accuracy']}, coincidencia {report['agreement']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,75 @@
+import argparse
+import json
+import subprocess
+import sys
+from time import perf_counter
+from typing import Dict
+
+from plate_cli.models import Models
+
+
+def import_time_ms(module: str) -> float:
+    """Tiempo acumulado de importar `module` en un intérprete limpio."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Formato: "import time: self [us] | cumulative | imported package"
+    for line in process.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+
+    raise RuntimeError(f"No se encontró {module} en la salida de -X importtime.")
+
+
+def models_ready_s() -> Dict[str, float]:
+    models = Models()
+
+    start = perf_counter()
+    models.load_async()
+    models.wait()
+    parallel = perf_counter() - start
+
+    return {"models_ready_s": round(parallel, 3)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo de importación y de arranque de PlateCLI"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Falla si importar plate_cli.main supera este tiempo",
+    )
+    parser.add_argument(
+        "--skip-models", action="store_true", help="No medir la carga de modelos"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Archivo JSON")
+
+    args = parser.parse_args()
+
+    report: Dict[str, float] = {
+        "import_main_ms": round(import_time_ms("plate_cli.main"), 1),
+        "import_app_ms": round(import_time_ms("plate_cli.app"), 1),
+    }
+    if not args.skip_models:
+        report.update(models_ready_s())
+
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget_ms is not None and report["import_main_ms"] > args.budget_ms:
+        print(
+            f"El import tarda {report['import_main_ms']} ms, "
+            f"por encima del presupuesto de {args.budget_ms} ms"
+        )
+        sys.exit(1)
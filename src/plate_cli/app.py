@@ -1,45 +1,99 @@
 from datetime import datetime
 from pathlib import Path
-from time import sleep
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import cv2
-import numpy as np
-from PIL import Image
 from rich.console import Group
 from rich.spinner import Spinner
 from rich.table import Table
 
 from plate_cli.cli import CLI
-from plate_cli.constants import ACCEPTED_IMAGE_FORMATS
-from plate_cli.models import Models
-from plate_cli.utils.draw_box import draw_box
+from plate_cli.constants import (
+    ACCEPTED_IMAGE_FORMATS,
+    BATCH_SIZE,
+    IMAGE_FORMAT,
+    IMAGE_QUALITY,
+    OUTPUT_FORMAT,
+    PREFETCH_WORKERS,
+    SERVE_BATCH_WINDOW,
+    SERVE_HOST,
+    SERVE_MAX_BATCH,
+    SERVE_MAX_BODY,
+    SERVE_PORT,
+)
+from plate_cli.models import Detection, Models
+from plate_cli.profiler import profiler
 from plate_cli.utils.menu import Menu
+from plate_cli.utils.source import CameraSource
+
+# cv2 y numpy se importan al usarse para que el menú aparezca cuanto antes
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
+    from plate_cli.cache import ResultCache
+    from plate_cli.image_writer import ImageWriter
+    from plate_cli.pipeline import CameraPipeline, TrackRow
+    from plate_cli.writers import ResultWriter
 
 
 class App:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        models: Models | None = None,
+        preload: bool = True,
+        cache: ResultCache | None = None,
+        output_format: str | None = None,
+        save_images: bool = True,
+        image_format: str = IMAGE_FORMAT,
+        image_quality: int = IMAGE_QUALITY,
+        crops_only: bool = False,
+        motion_gate: bool = False,
+        sources: List[CameraSource] | None = None,
+    ) -> None:
         self.cli = CLI()
-        self.models = Models()
+        self.models = models or Models()
+        self.cache = cache
+        # None: en el modo por lotes se deduce de la extensión de --output
+        self.output_format = output_format
+        self.save_images = save_images
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.crops_only = crops_only
+        self.motion_gate = motion_gate
+        # Índices de cámara, archivos de video o URLs RTSP/HTTP
+        self.sources = sources or [CameraSource("0")]
+        self._models_reported = False
         self.options = {
             "Cargar imágenes": self.process_path,
             "Detectar en tiempo real": self.run_camera,
             "Salir": self.exit,
         }
-        self.__setup()
+        if preload:
+            self.__setup()
 
     def __setup(self):
-        with self.cli.status(Spinner("dots", "[bold]Cargando modelo...")) as status:
-            self.models.load_yolo()
-            status.update(
-                Group(
-                    "[green]✓ Modelo cargado exitosamente",
-                    Spinner("dots", text="[bold]Cargando OCR..."),
-                )
-            )
-            self.models.load_reader()
+        # Los modelos cargan en segundo plano mientras el menú ya responde
+        self.models.load_async()
+
+    def _wait_models(self) -> None:
+        if not self.models.ready:
+            with self.cli.status(Spinner("dots", "[bold]Cargando modelos...")):
+                self.models.wait()
+        self._report_models()
+
+    def _report_models(self) -> None:
+        # La configuración elegida (dispositivo, hilos, backends) se muestra
+        # una sola vez, en cuanto termina la carga
+        if self._models_reported or not self.models.loaded:
+            return
+        self._models_reported = True
+        self.cli.success(f"[bold green]✓[/] Modelos cargados: {self.models.describe()}")
 
     def run(self) -> None:
         while True:
+            # El menú responde mientras cargan los modelos; la configuración se
+            # muestra en cuanto terminan, sin esperar a la primera inferencia
+            self._report_models()
             menu = Menu(self.options)
             choice = menu.run()
             if choice in self.options:
@@ -69,7 +123,7 @@ class App:
         output_dir = Path(f"results/{now.strftime('%Y%m%d%H%M%S')}")
 
         if path.is_file():
-            self.inference_from_file(path, output_dir)
+            files = [path]
         else:
             files = [
                 f
@@ -79,24 +133,206 @@ class App:
             if len(files) == 0:
                 self.cli.error("No se han encontrado imágenes en la carpeta")
                 return
-            for file in files:
-                self.inference_from_file(file, output_dir)
 
-    def inference_from_file(self, path: Path, output_dir: Path):
+        from plate_cli.image_writer import ImageWriter
+        from plate_cli.writers import open_writer
+
+        output_format = self.output_format or OUTPUT_FORMAT
+        results_path = output_dir / f"results.{output_format}"
+
+        image_writer = (
+            ImageWriter(self.image_format, self.image_quality, self.crops_only)
+            if self.save_images
+            else None
+        )
+
+        try:
+            with open_writer(results_path, output_format) as writer:
+                for file in files:
+                    self.inference_from_file(file, output_dir, writer, image_writer)
+        finally:
+            if image_writer is not None:
+                self._close_image_writer(image_writer)
+
+        self.cli.success(f"Resultados guardados en: [cyan]{results_path.resolve()}")
+
+    def _close_image_writer(self, image_writer: ImageWriter) -> None:
+        with self.cli.status(Spinner("dots", "[bold]Guardando imágenes...")):
+            image_writer.close()
+
+        for path, error in image_writer.errors:
+            self.cli.error(f"No se pudo guardar {path.name}: {error}")
+
+    def run_batch(
+        self,
+        path: Path,
+        output_path: Path | None = None,
+        batch_size: int = BATCH_SIZE,
+        workers: int = PREFETCH_WORKERS,
+        processes: int = 1,
+        threads_per_process: int | None = None,
+        shared_memory: bool = False,
+    ) -> None:
+        if not path.is_dir():
+            self.cli.error("La ruta no es una carpeta")
+            return
+
+        if output_path is None:
+            now = datetime.now()
+            extension = self.output_format or OUTPUT_FORMAT
+            output_path = Path(
+                f"results/{now.strftime('%Y%m%d%H%M%S')}/results.{extension}"
+            )
+
+        if processes > 1:
+            from plate_cli.pool import ProcessBatchRunner
+
+            # Cada proceso carga sus propios modelos; aquí no hace falta esperar
+            processor = ProcessBatchRunner(
+                processes,
+                self.models.options(),
+                threads_per_process,
+                batch_size,
+                shared_memory,
+                workers,
+                self.cache.path if self.cache is not None else None,
+                self.cache.max_bytes if self.cache is not None else 0,
+            )
+        else:
+            from plate_cli.batch import BatchProcessor
+
+            self._wait_models()
+            processor = BatchProcessor(self.models, batch_size, workers, self.cache)
+
+        start = perf_counter()
+        with self.cli.status(
+            Spinner("dots", f"[bold]Procesando imágenes de {path.name}...")
+        ):
+            processed = processor.run(path, output_path, self.output_format)
+        elapsed = perf_counter() - start
+
+        if processed == 0:
+            self.cli.error("No se han encontrado imágenes en la carpeta")
+            return
+
+        summary = (
+            f"[bold green]✓[/] {processed} imágenes procesadas en {elapsed:.1f}s "
+            f"({processed / elapsed:.1f} img/s)\n"
+            f"Resultados guardados en: [cyan]{output_path.resolve()}"
+        )
+        # Con varios procesos los contadores quedan en cada proceso
+        cascade = self._cascade_summary() if processes <= 1 else None
+        if cascade is not None:
+            summary += f"\n{cascade}"
+        self.cli.success(summary)
+
+    def run_server(
+        self,
+        host: str = SERVE_HOST,
+        port: int = SERVE_PORT,
+        socket_path: Path | None = None,
+        max_batch_size: int = SERVE_MAX_BATCH,
+        batch_window: float = SERVE_BATCH_WINDOW,
+        max_body: int = SERVE_MAX_BODY,
+    ) -> None:
+        from plate_cli.server import DetectionServer
+
+        self._wait_models()
+
+        server = DetectionServer(self.models, max_batch_size, batch_window, max_body)
+        server.bind(host, port, socket_path)
+
+        address = socket_path.resolve() if socket_path else f"http://{host}:{port}"
+        self.cli.success(
+            f"[bold green]✓[/] Servidor escuchando en [cyan]{address}[/]\n"
+            "POST /detect con la imagen en el cuerpo · Ctrl+C para salir"
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.exit()
+
+    def inference_from_file(
+        self,
+        path: Path,
+        output_dir: Path,
+        writer: ResultWriter | None = None,
+        image_writer: ImageWriter | None = None,
+    ):
         if path.suffix not in ACCEPTED_IMAGE_FORMATS:
             self.cli.error("Extensión no soportada")
             return
 
-        image = Image.open(path)
+        key: str | None = None
+        detections: List[Detection] | None = None
+        timings: Dict[str, float] = {}
+        if self.cache is not None:
+            # La clave incluye los pesos del detector: se esperan los modelos
+            # para no exportarlos a la vez que la carga en segundo plano
+            self._wait_models()
+            key = self.cache.key(path)
+            detections = self.cache.get(key)
+
+        image: MatLike | None = None
+
+        if detections is None:
+            image = self._open_image(path)
+            detections, timings = self._detect(image, path)
+            if self.cache is not None and key is not None:
+                self.cache.put(key, detections)
+        elif image_writer is not None:
+            # En un acierto de caché la imagen anotada se regenera sin los modelos
+            image = self._open_image(path)
+
+        if writer is not None:
+            writer.write(
+                {
+                    "path": str(path),
+                    "detections": [detection._asdict() for detection in detections],
+                    "timings": timings,
+                }
+            )
+            writer.flush()
+
+        if not detections:
+            self.cli.error("No se encontró ninguna matrícula")
+            return
+
+        plates = ", ".join(f"{d.country}: {d.text}" for d in detections)
+        message = (
+            f"[bold green]✓[/] {len(detections)} matrícula(s) detectada(s): {plates}"
+        )
+
+        if image is not None and image_writer is not None:
+            # Se dibuja y guarda en segundo plano mientras se procesa la siguiente
+            saved_paths = image_writer.submit(image, path, detections, output_dir)
+            message += "\nImagen guardada en: " + ", ".join(
+                f"[cyan]{saved_path}[/]" for saved_path in saved_paths
+            )
+
+        self.cli.success(message)
+
+    def _open_image(self, path: Path) -> MatLike:
+        from plate_cli.batch import decode_image
+
+        return decode_image(path)
+
+    def _detect(
+        self, image: MatLike, path: Path
+    ) -> Tuple[List[Detection], Dict[str, float]]:
+        # Sin caché es la primera vez que hacen falta los modelos
+        self._wait_models()
 
         with self.cli.status(
             Spinner("dots", f"[bold]Detectando matrícula en {path.name}...")
         ) as status:
+            start = perf_counter()
             result = self.models.inference(image)[0]
+            timings = {"inference_ms": round((perf_counter() - start) * 1000, 2)}
 
             if not result.boxes:
-                self.cli.error("No se encontró ninguna matrícula")
-                return
+                return [], timings
 
             status.update(
                 Group(
@@ -104,80 +340,212 @@ class App:
                 )
             )
 
-        class_id = int(result.boxes[0].cls.item())
-        class_name = result.names[class_id]
-        text = self.models.get_text_from_image(image, result.boxes[0], class_name)
+        start = perf_counter()
+        detections = self.models.read_plates(image, result)
+        timings["ocr_ms"] = round((perf_counter() - start) * 1000, 2)
 
-        image = Image.fromarray(draw_box(np.array(image), result, text))
+        return detections, timings
 
-        saved_image_path = self._save_image(image, class_name, text, output_dir)
-        self.cli.success(
-            f"[bold green]✓[/] Imagen guardada en: [cyan]{saved_image_path}"
-        )
+    def run_camera(self, sources: List[CameraSource] | None = None) -> None:
+        import cv2
 
-    def run_camera(self) -> None:
-        capture = cv2.VideoCapture(0)
-        if not capture.isOpened():
-            self.cli.error("No se pudo abrir la cámara")
-            return
+        from plate_cli.pipeline import CameraPipeline, open_capture
+        from plate_cli.utils.draw_box import draw_box
+        from plate_cli.utils.motion import MotionGate
 
-        table = Table(title="Detección en tiempo real", show_header=True)
-        table.add_column("País", style="cyan")
-        table.add_column("Matrícula", style="magenta")
-        table.add_column("Confianza", style="green")
+        sources = sources or self.sources
+
+        self._wait_models()
+
+        pipelines: List[CameraPipeline] = []
+        for source in sources:
+            capture = open_capture(source.source)
+            if not capture.isOpened():
+                self.cli.error(f"No se pudo abrir la fuente {source.source}")
+                for pipeline in pipelines:
+                    pipeline.capture.release()
+                return
+            pipelines.append(
+                CameraPipeline(
+                    self.models,
+                    capture,
+                    motion_gate=MotionGate() if self.motion_gate else None,
+                    name=source.source,
+                    roi=source.roi,
+                    imgsz=source.imgsz,
+                )
+            )
+
+        # Un frame por fuente como máximo en cada lote del detector
+        self.models.start_scheduler(max_batch_size=len(pipelines))
 
-        with self.cli.status(table, title="PlateCLI") as status:
+        with self.cli.status(
+            self._camera_view(pipelines, {}), title="PlateCLI"
+        ) as status:
+            for pipeline in pipelines:
+                pipeline.start()
             try:
-                while True:
-                    return_value, frame = capture.read()
-                    if not return_value:
+                frame_sequences = {pipeline.name: 0 for pipeline in pipelines}
+                detections_sequences = {pipeline.name: 0 for pipeline in pipelines}
+                tracks_sequences = {pipeline.name: 0 for pipeline in pipelines}
+                detections: Dict[str, List[Detection]] = {}
+                rows: Dict[str, List[TrackRow]] = {}
+                last_view = 0.0
+
+                while any(pipeline.running for pipeline in pipelines):
+                    for pipeline in pipelines:
+                        name = pipeline.name
+                        frame_sequences[name], item = pipeline.frames.get(
+                            frame_sequences[name], timeout=0.01
+                        )
+                        if item is None:
+                            continue
+
+                        detections_sequences[name], new_detections = (
+                            pipeline.detections.get(detections_sequences[name], 0)
+                        )
+                        if new_detections is not None:
+                            detections[name] = new_detections
+
+                        tracks_sequences[name], new_rows = pipeline.tracks.get(
+                            tracks_sequences[name], timeout=0
+                        )
+                        if new_rows is not None:
+                            rows[name] = new_rows
+
+                        # El frame es compartido con los hilos de detección y OCR
+                        with profiler.stage("draw_box"):
+                            frame = draw_box(item[0].copy(), detections.get(name, []))
+
+                        cv2.imshow(f"{name} - Presiona 'q' para salir", frame)
+
+                    if perf_counter() - last_view >= 0.5:
+                        status.update(self._camera_view(pipelines, rows))
+                        last_view = perf_counter()
+
+                    if cv2.waitKey(1) & 0xFF == ord("q"):
                         break
+            finally:
+                for pipeline in pipelines:
+                    pipeline.stop()
+                    pipeline.capture.release()
+                cv2.destroyAllWindows()
 
-                    results = self.models.inference(frame)
+        for pipeline in pipelines:
+            gate = pipeline.motion_gate
+            if gate is not None and gate.checked:
+                self.cli.success(
+                    f"{pipeline.name}: {gate.skipped} de {gate.checked} frames sin "
+                    "cambios no pasaron por el detector"
+                )
 
-                    found = False
-                    for result in results:
-                        if result.boxes:
-                            found = True
-                            box = result.boxes[0]
+    def _camera_view(
+        self, pipelines: List[CameraPipeline], rows: Dict[str, List[TrackRow]]
+    ) -> Group:
+        streams = Table(title="Fuentes", show_header=True)
+        streams.add_column("Fuente", style="cyan")
+        streams.add_column("FPS captura", justify="right")
+        streams.add_column("FPS detección", justify="right", style="green")
+        streams.add_column("Latencia (ms)", justify="right", style="yellow")
+
+        for pipeline in pipelines:
+            capture_fps, detection_fps, latency_ms = pipeline.stats.snapshot()
+            streams.add_row(
+                pipeline.name,
+                f"{capture_fps:.1f}",
+                f"{detection_fps:.1f}",
+                f"{latency_ms:.0f}",
+            )
 
-                            # Convertir frame a imagen RGB y luego a imagen PIL para usarse en el OCR
-                            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            pil_img = Image.fromarray(img_rgb)
+        return Group(streams, self._tracks_table(rows))
 
-                            conf = f"{box.conf.item():.2f}"
-                            class_name = result.names[int(box.cls.item())]
+    def _tracks_table(self, rows: Dict[str, List[TrackRow]]) -> Table:
+        table = Table(title="Detección en tiempo real", show_header=True)
+        table.add_column("Fuente", style="bright_black")
+        table.add_column("ID", style="bright_blue")
+        table.add_column("País", style="cyan")
+        table.add_column("Matrícula", style="magenta")
+        table.add_column("Confianza", style="green")
+        table.add_column("Lecturas", style="yellow")
+
+        for source, source_rows in rows.items():
+            for track_id, country, text, confidence, readings in source_rows:
+                table.add_row(
+                    source,
+                    str(track_id),
+                    country,
+                    text,
+                    f"{confidence:.2f}",
+                    str(readings),
+                )
 
-                            text = self.models.get_text_from_image(
-                                pil_img, box, class_name
-                            )
+        return table
+
+    def print_profile(self, output_path: Path | None = None) -> None:
+        table = Table(title="Tiempo por etapa", show_header=True)
+        table.add_column("Etapa", style="cyan")
+        table.add_column("Llamadas", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("p50 (ms)", justify="right", style="green")
+        table.add_column("p95 (ms)", justify="right", style="yellow")
+        table.add_column("p99 (ms)", justify="right", style="red")
+
+        for name, count, total, p50, p95, p99 in profiler.summary():
+            table.add_row(
+                name,
+                str(count),
+                f"{total:.2f}",
+                f"{p50:.1f}",
+                f"{p95:.1f}",
+                f"{p99:.1f}",
+            )
 
-                            draw_box(frame, result, text)
+        self.cli.print(table, padding=(1, 2))
 
-                            table.add_row(class_name, text, conf)
+        cascade = self._cascade_summary()
+        if cascade is not None:
+            self.cli.print(cascade, padding=(0, 2))
 
-                    if found:
-                        status.update(table)
+        if output_path is not None:
+            profiler.dump(output_path)
+            self.cli.success(
+                f"[bold green]✓[/] Traza guardada en: [cyan]{output_path.resolve()}"
+            )
 
-                    cv2.imshow("Presiona 'q' para salir", frame)
-                    if cv2.waitKey(1) & 0xFF == ord("q"):
-                        break
-            finally:
-                capture.release()
-                cv2.destroyAllWindows()
+    def _cascade_summary(self) -> str | None:
+        stats = self.models.cascade_stats
+        total = sum(stats.values())
+        if not self.models.uses_cascade or total == 0:
+            return None
 
-    def exit(self) -> None:
-        self.cli.print("[bold]¡Que tenga un buen día! :waving_hand:[/]", width=40)
+        return (
+            f"OCR en cascada: {stats['light'] / total:.0%} resuelto con "
+            f"preprocesamiento ligero, {stats['heavy'] / total:.0%} con el "
+            f"completo y {stats['failed'] / total:.0%} sin formato válido"
+        )
 
-    def _save_image(
-        self, image: Image.Image, class_name: str, text: str, output_dir: Path
-    ) -> Path:
-        filename = f"{class_name}_{text.replace(' ', '_')}.jpg"
+    def clear_cache(self) -> None:
+        if self.cache is None:
+            self.cli.error("La caché está desactivada")
+            return
 
-        output_dir.mkdir(exist_ok=True, parents=True)
+        deleted = self.cache.clear()
+        self.cli.success(
+            f"[bold green]✓[/] {deleted} resultado(s) eliminados de la caché\n"
+            f"Archivo: [cyan]{self.cache.path.resolve()}"
+        )
 
-        save_path = output_dir / filename
+    def cache_info(self) -> None:
+        if self.cache is None:
+            self.cli.error("La caché está desactivada")
+            return
 
-        image.save(save_path)
+        entries, size = self.cache.stats()
+        self.cli.success(
+            f"{entries} resultado(s), {size / 1024 / 1024:.1f} MB de "
+            f"{self.cache.max_bytes / 1024 / 1024:.0f} MB\n"
+            f"Archivo: [cyan]{self.cache.path.resolve()}"
+        )
 
-        return save_path.resolve()
+    def exit(self) -> None:
+        self.cli.print("[bold]¡Que tenga un buen día! :waving_hand:[/]", width=40)
@@ -0,0 +1,177 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, NamedTuple, Tuple
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from plate_cli.constants import ACCEPTED_IMAGE_FORMATS, BATCH_SIZE, PREFETCH_WORKERS
+from plate_cli.models import Detection, Models
+from plate_cli.profiler import profiler
+from plate_cli.writers import open_writer
+
+if TYPE_CHECKING:
+    from plate_cli.cache import ResultCache
+
+
+class Cached(NamedTuple):
+    """Detecciones guardadas en la caché para una imagen que no se decodificó."""
+
+    detections: List[Detection]
+
+
+Decoded = Tuple[Path, MatLike | Exception | Cached]
+
+
+def iter_images(path: Path) -> Iterator[Path]:
+    """Recorre la carpeta de forma perezosa, sin listar todos los archivos."""
+    for file in path.iterdir():
+        if file.is_file() and file.suffix in ACCEPTED_IMAGE_FORMATS:
+            yield file
+
+
+def decode_image(path: Path) -> MatLike:
+    """Decodifica directamente a un arreglo BGR, sin pasar por PIL."""
+    with profiler.stage("decode"):
+        # imdecode + fromfile admite rutas con caracteres no ASCII en Windows
+        image = cv2.imdecode(np.fromfile(path, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise OSError(f"No se pudo decodificar la imagen {path}")
+    return image
+
+
+class BatchProcessor:
+    def __init__(
+        self,
+        models: Models,
+        batch_size: int = BATCH_SIZE,
+        workers: int = PREFETCH_WORKERS,
+        cache: ResultCache | None = None,
+    ) -> None:
+        self.models = models
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.cache = cache
+
+    def run(
+        self, path: Path, output_path: Path, output_format: str | None = None
+    ) -> int:
+        """Procesa la carpeta y escribe una fila por detección (JSONL, CSV o
+        Parquet según la extensión de `output_path`)."""
+        processed = 0
+
+        with (
+            open_writer(output_path, output_format) as writer,
+            ThreadPoolExecutor(self.workers) as executor,
+        ):
+            for batch in self._batches(self._prefetch(executor, iter_images(path))):
+                for record in self.process_batch(batch):
+                    writer.write(record)
+                    processed += 1
+                writer.flush()
+
+        return processed
+
+    def process_batch(self, batch: List[Decoded]) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = [
+            {"path": str(path), "error": str(image)} for path, image in batch
+        ]
+
+        # Índice en el lote, imagen y clave de caché de las que hay que inferir
+        pending: List[Tuple[int, MatLike, str | None]] = []
+
+        for index, (path, image) in enumerate(batch):
+            if isinstance(image, Exception):
+                continue
+            if isinstance(image, Cached):
+                records[index] = self._record(path, image.detections)
+                continue
+
+            key: str | None = None
+            if self.cache is not None:
+                key = self.cache.key(path)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    records[index] = self._record(path, cached)
+                    continue
+
+            pending.append((index, image, key))
+
+        if not pending:
+            return records
+
+        images = [image for _, image, _ in pending]
+
+        start = perf_counter()
+        results = self.models.inference(images)
+        inference_time = perf_counter() - start
+
+        start = perf_counter()
+        detections = self.models.read_plates_batch(images, results)
+        ocr_time = perf_counter() - start
+
+        # El lote se procesa de una vez: el tiempo se reparte entre sus imágenes
+        timings = {
+            "inference_ms": round(inference_time / len(images) * 1000, 2),
+            "ocr_ms": round(ocr_time / len(images) * 1000, 2),
+        }
+
+        for (index, _, key), plates in zip(pending, detections):
+            if self.cache is not None and key is not None:
+                self.cache.put(key, plates)
+            records[index] = self._record(batch[index][0], plates, timings)
+
+        return records
+
+    def load(self, path: Path) -> Decoded:
+        """Busca la imagen en la caché y la decodifica solo si no está: un
+        acierto no paga cv2.imdecode."""
+        if self.cache is not None:
+            cached = self.cache.get(self.cache.key(path))
+            if cached is not None:
+                return path, Cached(cached)
+
+        try:
+            return path, decode_image(path)
+        except OSError as error:
+            return path, error
+
+    def _record(
+        self,
+        path: Path,
+        detections: List[Detection],
+        timings: Dict[str, float] | None = None,
+    ) -> Dict[str, Any]:
+        return {
+            "path": str(path),
+            "detections": [detection._asdict() for detection in detections],
+            "timings": timings or {},
+        }
+
+    def _prefetch(
+        self, executor: ThreadPoolExecutor, paths: Iterator[Path]
+    ) -> Iterator[Decoded]:
+        """Carga las imágenes en paralelo manteniendo el orden de entrada."""
+        pending: Deque[Future[Decoded]] = deque()
+        window = self.batch_size * 2
+
+        for path in paths:
+            pending.append(executor.submit(self.load, path))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def _batches(self, decoded: Iterator[Decoded]) -> Iterator[List[Decoded]]:
+        batch: List[Decoded] = []
+        for item in decoded:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
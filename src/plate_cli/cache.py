@@ -0,0 +1,209 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List, Tuple
+
+from plate_cli.constants import (
+    CACHE_MAX_BYTES,
+    CACHE_PATH,
+    CONF_THRESHOLD,
+    NMS_THRESHOLD,
+    OCR_ALLOWLIST,
+    YOLO_MODEL_PATH,
+)
+from plate_cli.models import Detection, Models
+from plate_cli.profiler import profiler
+
+
+def file_hash(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@lru_cache
+def _weights_hash(path: Path, mtime_ns: int, size: int) -> str:
+    # mtime y tamaño forman parte de la clave para detectar pesos reemplazados
+    return file_hash(path)
+
+
+def weights_hash(path: Path) -> str:
+    """Hash de un archivo de pesos o de un directorio exportado (OpenVINO)."""
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for file in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(f"{file.relative_to(path)}:{weights_hash(file)}".encode())
+        return digest.hexdigest()
+
+    stat = path.stat()
+    return _weights_hash(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _image_hash(path: Path, mtime_ns: int, size: int) -> str:
+    # El lote consulta la clave al leer la carpeta y otra vez al inferir; con
+    # la misma fecha y tamaño no se vuelve a leer el archivo
+    return file_hash(path)
+
+
+def _bbox(values: List[int]) -> Tuple[int, int, int, int]:
+    x_min, y_min, x_max, y_max = values
+    return (x_min, y_min, x_max, y_max)
+
+
+class ResultCache:
+    """Caché en disco de detecciones, indexada por el contenido de la imagen y
+    por todo lo que cambia el resultado: los pesos que usa el detector, los
+    umbrales y las opciones de `Models` (preprocesamiento, región de interés,
+    modo del OCR...), con el backend y el dispositivo ya resueltos."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        max_bytes: int = CACHE_MAX_BYTES,
+        models: Models | None = None,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max(0, max_bytes)
+        self.models = models
+        self._model_key: str | None = None
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+        # Varios procesos del pool comparten el archivo; WAL permite leer mientras
+        # otro escribe
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, detections TEXT NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self._connection.commit()
+        self._size = self._total_size()
+
+    @property
+    def model_key(self) -> str:
+        if self._model_key is None:
+            weights = YOLO_MODEL_PATH
+            options: Dict[str, Any] = {}
+            if self.models is not None:
+                # El modelo exportado (ONNX, OpenVINO, INT8) es el que da el
+                # resultado, no weights.pt
+                weights = self.models.detector_weights()
+                options = {
+                    **self.models.options(),
+                    "detector_backend": self.models.backend,
+                    "device": self.models.resolve_device(),
+                }
+
+            parts = [
+                weights_hash(weights),
+                str(CONF_THRESHOLD),
+                str(NMS_THRESHOLD),
+                OCR_ALLOWLIST,
+                json.dumps(options, sort_keys=True, default=repr),
+            ]
+            # Cuenta el contenido del JSON de perfiles, no solo su ruta
+            country_profiles = options.get("country_profiles")
+            if country_profiles is not None:
+                parts.append(file_hash(country_profiles))
+            self._model_key = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return self._model_key
+
+    def key(self, image_path: Path) -> str:
+        with profiler.stage("cache_hash"):
+            stat = image_path.stat()
+            digest = _image_hash(image_path, stat.st_mtime_ns, stat.st_size)
+            return f"{digest}:{self.model_key}"
+
+    def get(self, key: str) -> List[Detection] | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT detections FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time(), key)
+            )
+            self._connection.commit()
+
+        return [
+            Detection(
+                item["country"],
+                item["text"],
+                item["confidence"],
+                _bbox(item["bbox"]),
+            )
+            for item in json.loads(row[0])
+        ]
+
+    def put(self, key: str, detections: List[Detection]) -> None:
+        payload = json.dumps(
+            [detection._asdict() for detection in detections], ensure_ascii=False
+        )
+        size = len(key) + len(payload)
+
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, payload, size, time()),
+            )
+            self._size += size - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._connection.commit()
+
+    def clear(self) -> int:
+        """Invalida toda la caché y devuelve la cantidad de entradas borradas."""
+        with self._lock:
+            deleted = self._connection.execute("DELETE FROM results").rowcount
+            self._connection.commit()
+            self._connection.execute("VACUUM")
+            self._size = 0
+        return deleted
+
+    def stats(self) -> Tuple[int, int]:
+        """Cantidad de entradas y bytes ocupados."""
+        with self._lock:
+            count = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+            return count[0], self._total_size()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _total_size(self) -> int:
+        row = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        # Otros procesos pueden haber escrito: se recalcula antes de borrar
+        self._size = self._total_size()
+        excess = self._size - self.max_bytes
+        if excess <= 0:
+            return
+
+        victims: List[Tuple[str]] = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+            self._size -= size
+
+        self._connection.executemany("DELETE FROM results WHERE key = ?", victims)
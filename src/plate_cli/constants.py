@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
 ACCEPTED_IMAGE_FORMATS = [".jpg", ".jpeg", ".png", ".webp"]
 
@@ -21,14 +21,113 @@ COUNTRIES: Dict[str, str] = {
 
 YOLO_MODEL_PATH = (Path(__file__).parent / "models/v1/weights.pt").resolve()
 
+# Motor del detector. Los pesos se convierten una vez a ONNX u OpenVINO y el
+# resultado se guarda en EXPORT_DIR. "auto" usa PyTorch si hay GPU y, si no, el
+# primer backend de CPU instalado
+DETECTOR_BACKENDS = ("auto", "torch", "onnx", "openvino")
+DETECTOR_BACKEND = "auto"
+DETECTOR_CPU_BACKENDS = ("openvino", "onnx")
+EXPORT_DIR = Path.home() / ".cache" / "plate-cli" / "models"
+
+# Las imágenes circulan como arreglos NumPy en el orden de canales de OpenCV
+COLOR_ORDER = "bgr"
+
 CONF_THRESHOLD = 0.63  # Limita el nivel de confianza aceptable
 NMS_THRESHOLD = 0.5  # Evita detecciones solapadas
 
-OCR_BLOCKLIST = (
-    "¡!¿?@#$%&/()=?¿[]{}-.,;:_+'*<>|°\"\\"
-    "áéíóúÁÉÍÓÚàèìòùÀÈÌÒÙâêîôûÂÊÎÔÛäëïöüÄËÏÖÜ"
-    "ñÑçÇ"
-    "¬~`^"
-    "€£¥$¢"
-    "±÷×¶§©®™ª"
-)
+# Dispositivo de los modelos; "auto" usa la GPU si torch la encuentra
+DEVICES = ("auto", "cpu", "cuda")
+DEVICE = "auto"
+OCR_LANGUAGES = ["es", "pt"]  # Comparten el mismo modelo latino de EasyOCR
+
+# Detección por ventanas: en imágenes grandes YOLO recorre ventanas solapadas
+# de --tile-size píxeles en lugar de reducir el frame completo
+TILE_OVERLAP = 0.2  # Fracción de la ventana compartida con la vecina
+TILE_BATCH = 16  # Ventanas por llamada a YOLO
+TILE_MATCH_THRESHOLD = 0.8  # Intersección sobre la caja menor para unir cortes
+
+BATCH_SIZE = 16  # Imágenes enviadas a YOLO en una sola llamada
+PREFETCH_WORKERS = 4  # Hilos que decodifican imágenes por adelantado
+OCR_BATCH_SIZE = 32  # Regiones de texto por pasada del reconocedor
+
+# "detect": detector CRAFT + reconocedor; "recognize": solo el reconocedor sobre
+# las líneas separadas por proyección
+OCR_MODES = ("detect", "recognize")
+OCR_MODE = "detect"
+LINE_MIN_INK = 0.02  # Fracción de píxeles de tinta para que una fila sea texto
+LINE_MAX_INK = 0.95  # Por encima, la fila es el marco de la placa
+LINE_MIN_HEIGHT = 0.2  # Altura mínima de una línea respecto del recorte
+
+# "quality": aumento 4x y NLM; "fast": filtra antes de escalar y escala según tamaño
+PREPROCESS_PROFILES = ("quality", "fast", "light")
+PREPROCESS_PROFILE = "quality"
+FAST_TARGET_HEIGHT = 160  # Altura en píxeles a la que se escala el recorte en "fast"
+
+# OCR en cascada: primero el perfil barato; se repite con el perfil elegido si
+# la lectura no respeta el formato del país o la confianza es baja
+CASCADE_PROFILE = "light"
+CASCADE_MIN_CONFIDENCE = 0.5
+
+# Parámetros de preprocesamiento por país. `crop` son las proporciones
+# (arriba, abajo, izquierda, derecha) a conservar; en "fast", `upscale` es el
+# aumento máximo. Se pueden sobrescribir con un JSON (--country-profiles)
+DEFAULT_COUNTRY_PROFILE: Dict[str, Any] = {
+    "crop": (0.0, 1.0, 0.0, 1.0),
+    "upscale": 4.0,
+    "clahe_clip": 2.0,
+    "clahe_grid": 8,
+    "kernel": 6,
+    "threshold": "otsu",  # "otsu" o "adaptive"
+}
+
+COUNTRY_PROFILES: Dict[str, Dict[str, Any]] = {
+    "argentina": {"crop": (0.2, 1.0, 0.0, 1.0)},
+    "bolivia": {"crop": (0.2, 1.0, 0.0, 1.0)},
+    "brazil": {"crop": (0.25, 1.0, 0.05, 0.95)},
+    "chile": {"crop": (0.0, 0.9, 0.0, 1.0)},
+}
+
+SCHEDULER_MAX_BATCH = 8  # Imágenes por inferencia como máximo en el planificador
+SCHEDULER_MAX_WAIT = 0.005  # Segundos que espera una imagen a completar su lote
+
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8000
+SERVE_MAX_BATCH = 8  # Peticiones agrupadas como máximo en una inferencia
+SERVE_BATCH_WINDOW = 0.01  # Segundos que se esperan peticiones para un lote
+SERVE_MAX_BODY = 20 * 1024 * 1024  # Bytes de imagen aceptados por petición
+
+# Formatos de la salida estructurada; por defecto se deduce de la extensión
+OUTPUT_FORMATS = ("jsonl", "csv", "parquet")
+OUTPUT_FORMAT = "jsonl"
+PARQUET_ROW_GROUP = 1000  # Detecciones por grupo de filas al escribir Parquet
+
+# Imágenes anotadas: se dibujan y codifican en hilos aparte
+IMAGE_FORMATS = ("jpg", "png", "webp")
+IMAGE_FORMAT = "jpg"
+IMAGE_QUALITY = 90  # Calidad JPEG/WebP
+IMAGE_WRITER_WORKERS = 2  # Hilos que codifican y guardan imágenes
+IMAGE_WRITER_QUEUE = 8  # Imágenes pendientes antes de frenar la inferencia
+
+# Caché de resultados indexada por el contenido de la imagen
+CACHE_PATH = Path.home() / ".cache" / "plate-cli" / "results.sqlite3"
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Al superarlo se borran las menos usadas
+
+OCR_QUEUE_SIZE = 2  # Detecciones pendientes de OCR en tiempo real
+STREAM_STATS_SMOOTHING = 0.1  # Peso de cada medición nueva en los FPS por fuente
+
+# Detección por movimiento en tiempo real: YOLO solo corre si el frame cambió
+MOTION_WIDTH = 160  # Ancho en píxeles del frame reducido que se compara
+MOTION_PIXEL_THRESHOLD = 25  # Diferencia de gris para considerar un píxel cambiado
+MOTION_MIN_AREA = 0.002  # Fracción de píxeles cambiados que dispara la detección
+MOTION_REFRESH_INTERVAL = 2.0  # Segundos máximos sin detectar aunque no haya cambios
+
+TRACK_IOU_THRESHOLD = 0.3  # Solapamiento mínimo para asociar una caja a un track
+TRACK_MAX_DISTANCE = 0.5  # Distancia máxima entre centros relativa a la diagonal
+TRACK_MAX_MISSED = 15  # Frames sin detección antes de cerrar un track
+TRACK_OCR_INTERVAL = 10  # Frames entre lecturas de refinamiento
+TRACK_MAX_READINGS = 5  # Lecturas votadas por track antes de dejar de leer
+TRACK_HISTORY = 20  # Tracks finalizados que se siguen mostrando en la tabla
+
+# Las matrículas solo usan letras y dígitos: el resto de los caracteres del
+# reconocedor se descartan al decodificar
+OCR_ALLOWLIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
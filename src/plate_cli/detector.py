@@ -0,0 +1,172 @@
+import hashlib
+import shutil
+import tempfile
+import threading
+from importlib.util import find_spec
+from pathlib import Path
+from typing import List
+
+from plate_cli.constants import (
+    DETECTOR_BACKEND,
+    DETECTOR_BACKENDS,
+    DETECTOR_CPU_BACKENDS,
+    EXPORT_DIR,
+    YOLO_MODEL_PATH,
+)
+from plate_cli.profiler import profiler
+
+# Módulo que necesita cada backend para ejecutarse
+_RUNTIMES = {"torch": "torch", "onnx": "onnxruntime", "openvino": "openvino"}
+
+# Evita que dos hilos exporten el mismo modelo a la vez
+_export_lock = threading.Lock()
+
+
+def available_backends() -> List[str]:
+    """Backends instalados, sin importar sus módulos."""
+    return [
+        backend
+        for backend, module in _RUNTIMES.items()
+        if find_spec(module) is not None
+    ]
+
+
+def resolve_backend(
+    backend: str = DETECTOR_BACKEND, int8: bool = False, gpu: bool | None = None
+) -> str:
+    """Traduce `auto` al backend más rápido disponible: PyTorch si hay GPU y,
+    si no, el primero de `DETECTOR_CPU_BACKENDS` que esté instalado. Con INT8
+    solo sirven los backends de CPU. `gpu` None: lo decide torch."""
+    if backend not in DETECTOR_BACKENDS:
+        raise ValueError(f"Backend del detector desconocido: {backend}")
+
+    available = available_backends()
+    if backend != "auto":
+        if backend not in available:
+            raise RuntimeError(
+                f"El backend {backend} requiere {_RUNTIMES[backend]}: "
+                f"pip install plate-cli[{backend}]"
+            )
+        return backend
+
+    if gpu is None:
+        import torch
+
+        gpu = torch.cuda.is_available()
+    if gpu and not int8:
+        return "torch"
+
+    for candidate in DETECTOR_CPU_BACKENDS:
+        if candidate in available:
+            return candidate
+    if int8:
+        raise RuntimeError(
+            "La cuantización INT8 requiere openvino u onnxruntime: "
+            "pip install plate-cli[openvino]"
+        )
+    return "torch"
+
+
+def artifact_path(
+    backend: str,
+    int8: bool = False,
+    weights: Path = YOLO_MODEL_PATH,
+    data: Path | None = None,
+) -> Path:
+    """Dónde queda el modelo convertido, en `EXPORT_DIR` y no junto a los pesos,
+    que pueden estar en un paquete instalado de solo lectura. Cada archivo de
+    pesos y cada conjunto de calibración producen un modelo distinto."""
+    if backend == "torch":
+        return weights
+
+    source = hashlib.sha256(str(weights.resolve()).encode()).hexdigest()[:8]
+    suffix = "_int8" if int8 else ""
+    if int8 and backend == "openvino" and data is not None:
+        suffix += f"_{hashlib.sha256(data.read_bytes()).hexdigest()[:8]}"
+    if backend == "onnx":
+        return EXPORT_DIR / f"{weights.stem}_{source}{suffix}.onnx"
+    return EXPORT_DIR / f"{weights.stem}_{source}{suffix}_openvino_model"
+
+
+def export_weights(
+    backend: str,
+    int8: bool = False,
+    weights: Path = YOLO_MODEL_PATH,
+    data: Path | None = None,
+) -> Path:
+    """Convierte los pesos al formato del backend la primera vez y reutiliza el
+    resultado mientras los pesos no cambien. `data` es el YAML del conjunto de
+    calibración que OpenVINO usa para cuantizar a INT8, obligatorio: sin él
+    ultralytics descarga COCO y calibra con imágenes que no son matrículas."""
+    if backend == "torch":
+        if int8:
+            raise ValueError("La cuantización INT8 requiere el backend onnx u openvino")
+        return weights
+    if backend == "openvino" and int8 and data is None:
+        raise ValueError(
+            "La cuantización INT8 de OpenVINO requiere --calibration-data con el "
+            "YAML de un conjunto de imágenes de matrículas"
+        )
+
+    target = artifact_path(backend, int8, weights, data)
+
+    with _export_lock:
+        if target.exists() and target.stat().st_mtime >= weights.stat().st_mtime:
+            return target
+
+        target.parent.mkdir(exist_ok=True, parents=True)
+        with (
+            profiler.stage(f"export:{backend}"),
+            tempfile.TemporaryDirectory(dir=target.parent) as workdir,
+        ):
+            # ultralytics exporta junto a los pesos que recibe: se trabaja sobre
+            # una copia para no escribir en el paquete ni dejar intermedios
+            source = Path(shutil.copy2(weights, workdir))
+            if backend == "onnx":
+                _export_onnx(source, target, int8)
+            else:
+                _export_openvino(source, target, int8, data)
+
+    return target
+
+
+def _export_onnx(weights: Path, target: Path, int8: bool) -> None:
+    from ultralytics.models import YOLO
+
+    # Lote y resolución dinámicos: el mismo archivo sirve para cualquier
+    # --batch-size, --imgsz o región de interés
+    exported = Path(YOLO(weights).export(format="onnx", dynamic=True, simplify=True))
+    if not int8:
+        _replace(exported, target)
+        return
+
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(exported, target, weight_type=QuantType.QUInt8)
+
+    # ultralytics lee las clases y la resolución de los metadatos del modelo
+    quantized = onnx.load(target)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(onnx.load(exported).metadata_props)
+    onnx.save(quantized, target)
+
+
+def _export_openvino(
+    weights: Path, target: Path, int8: bool, data: Path | None
+) -> None:
+    from ultralytics.models import YOLO
+
+    kwargs = {"data": str(data)} if int8 else {}
+    exported = Path(
+        YOLO(weights).export(format="openvino", dynamic=True, int8=int8, **kwargs)
+    )
+    _replace(exported, target)
+
+
+def _replace(source: Path, target: Path) -> None:
+    if source == target:
+        return
+    if target.is_dir():
+        shutil.rmtree(target)
+    source.replace(target)
@@ -0,0 +1,144 @@
+import queue
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import List, Tuple
+
+import cv2
+from cv2.typing import MatLike
+
+from plate_cli.constants import (
+    IMAGE_FORMAT,
+    IMAGE_QUALITY,
+    IMAGE_WRITER_QUEUE,
+    IMAGE_WRITER_WORKERS,
+)
+from plate_cli.models import Detection, crop_box
+from plate_cli.profiler import profiler
+from plate_cli.utils.draw_box import draw_box
+
+# Imagen original, detecciones y rutas donde se guardará
+_Job = Tuple[MatLike, List[Detection], List[Path]]
+
+
+class ImageWriter:
+    """Dibuja y codifica las imágenes anotadas en hilos aparte para que la
+    inferencia no espere al disco. La cola es acotada: si los hilos no dan
+    abasto, `submit` bloquea en lugar de acumular imágenes en memoria. Las
+    imágenes son arreglos BGR y se dibuja sobre ellas sin copiarlas, así que
+    dejan de pertenecer a quien las encola."""
+
+    def __init__(
+        self,
+        image_format: str = IMAGE_FORMAT,
+        quality: int = IMAGE_QUALITY,
+        crops_only: bool = False,
+        workers: int = IMAGE_WRITER_WORKERS,
+        queue_size: int = IMAGE_WRITER_QUEUE,
+    ) -> None:
+        self.image_format = image_format
+        self.quality = quality
+        self.crops_only = crops_only
+        self.errors: List[Tuple[Path, Exception]] = []
+
+        self._queue: queue.Queue[_Job | None] = queue.Queue(max(1, queue_size))
+        self._errors_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"image-writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        image: MatLike,
+        source: Path,
+        detections: List[Detection],
+        output_dir: Path,
+    ) -> List[Path]:
+        """Encola la imagen y devuelve las rutas que tendrán los archivos."""
+        output_dir.mkdir(exist_ok=True, parents=True)
+        paths = [output_dir / name for name in self._filenames(source, detections)]
+
+        with profiler.stage("image_queue"):
+            self._queue.put((image, detections, paths))
+
+        return [path.resolve() for path in paths]
+
+    def close(self) -> None:
+        """Espera a que se escriban todas las imágenes pendientes."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "ImageWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _filenames(self, source: Path, detections: List[Detection]) -> List[str]:
+        # El nombre del archivo de origen, con su extensión, evita que dos fotos
+        # de la misma matrícula se sobrescriban (auto.jpg y auto.png incluidas)
+        name = source.name.replace(".", "_")
+        if self.crops_only:
+            return [
+                f"{name}_{index}_{d.country}_{d.text.replace(' ', '_')}"
+                f".{self.image_format}"
+                for index, d in enumerate(detections)
+            ]
+
+        first = detections[0]
+        text = first.text.replace(" ", "_")
+        return [f"{name}_{first.country}_{text}.{self.image_format}"]
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            image, detections, paths = job
+            try:
+                self._write(image, detections, paths)
+            except Exception as error:
+                # Un error de cv2 no puede terminar el hilo: sin él nadie
+                # vaciaría la cola y submit/close esperarían para siempre
+                with self._errors_lock:
+                    self.errors.append((paths[0], error))
+
+    def _write(
+        self, image: MatLike, detections: List[Detection], paths: List[Path]
+    ) -> None:
+        if self.crops_only:
+            for detection, path in zip(detections, paths):
+                with profiler.stage("save"):
+                    self._save(crop_box(image, detection.bbox), path)
+            return
+
+        with profiler.stage("draw_box"):
+            draw_box(image, detections)
+
+        with profiler.stage("save"):
+            self._save(image, paths[0])
+
+    def _save(self, image: MatLike, path: Path) -> None:
+        params: List[int] = []
+        if self.image_format == "jpg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        elif self.image_format == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+
+        ok, encoded = cv2.imencode(f".{self.image_format}", image, params)
+        if not ok:
+            raise OSError(f"No se pudo codificar {path.name}")
+        # tofile admite rutas con caracteres no ASCII en Windows, a diferencia
+        # de cv2.imwrite
+        encoded.tofile(path)
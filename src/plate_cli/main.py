@@ -1,13 +1,404 @@
+import argparse
+from importlib.util import find_spec
+from pathlib import Path
+
 from rich.console import Console
 
 from plate_cli.app import App
+from plate_cli.constants import (
+    BATCH_SIZE,
+    CACHE_MAX_BYTES,
+    CACHE_PATH,
+    DETECTOR_BACKEND,
+    DETECTOR_BACKENDS,
+    DEVICE,
+    DEVICES,
+    IMAGE_FORMAT,
+    IMAGE_FORMATS,
+    IMAGE_QUALITY,
+    OCR_MODE,
+    OCR_MODES,
+    OUTPUT_FORMATS,
+    PREFETCH_WORKERS,
+    PREPROCESS_PROFILE,
+    PREPROCESS_PROFILES,
+    SERVE_BATCH_WINDOW,
+    SERVE_HOST,
+    SERVE_MAX_BATCH,
+    SERVE_MAX_BODY,
+    SERVE_PORT,
+    TILE_BATCH,
+    TILE_OVERLAP,
+)
+from plate_cli.models import Models
+from plate_cli.profiler import profiler
+from plate_cli.utils.roi import RegionOfInterest
+from plate_cli.utils.source import CameraSource
+from plate_cli.writers import resolve_format
 
 console = Console()
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="plate-cli",
+        description="Detección y reconocimiento de matrículas vehiculares",
+    )
+    parser.add_argument(
+        "--preprocess",
+        choices=PREPROCESS_PROFILES,
+        default=PREPROCESS_PROFILE,
+        help="Perfil de preprocesamiento de los recortes antes del OCR",
+    )
+    parser.add_argument(
+        "--country-profiles",
+        type=Path,
+        default=None,
+        help="JSON con parámetros de preprocesamiento por país",
+    )
+    parser.add_argument(
+        "--roi",
+        type=RegionOfInterest.parse,
+        default=None,
+        metavar="X_MIN,Y_MIN,X_MAX,Y_MAX",
+        help="Región donde buscar matrículas, en proporciones (0-1) o píxeles",
+    )
+    parser.add_argument(
+        "--imgsz",
+        type=int,
+        default=None,
+        help="Resolución de inferencia de YOLO (por defecto, la del modelo)",
+    )
+    parser.add_argument(
+        "--ocr-mode",
+        choices=OCR_MODES,
+        default=OCR_MODE,
+        help="detect usa el detector de texto de EasyOCR; recognize solo separa "
+        "las líneas del recorte de YOLO y reconoce",
+    )
+    parser.add_argument(
+        "--ocr-low-memory",
+        action="store_true",
+        help="No carga el detector de texto de EasyOCR (implica --ocr-mode recognize)",
+    )
+    parser.add_argument(
+        "--ocr-cascade",
+        action="store_true",
+        help="Lee primero con preprocesamiento ligero y usa --preprocess solo si "
+        "la lectura no respeta el formato del país",
+    )
+    parser.add_argument(
+        "--device",
+        choices=DEVICES,
+        default=DEVICE,
+        help="Dispositivo de los modelos; auto usa la GPU si está disponible",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Hilos de torch en CPU (por defecto, los que elige torch)",
+    )
+    parser.add_argument(
+        "--detector-backend",
+        choices=DETECTOR_BACKENDS,
+        default=DETECTOR_BACKEND,
+        help="Motor de YOLO; auto elige el más rápido instalado",
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Usa el detector cuantizado a INT8 (backends onnx y openvino)",
+    )
+    parser.add_argument(
+        "--calibration-data",
+        type=Path,
+        default=None,
+        help="YAML de imágenes para calibrar OpenVINO INT8 (obligatorio con --int8)",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=None,
+        help="Detecta en ventanas solapadas de este tamaño (para imágenes grandes)",
+    )
+    parser.add_argument(
+        "--tile-overlap",
+        type=float,
+        default=TILE_OVERLAP,
+        help="Fracción de cada ventana compartida con la vecina",
+    )
+    parser.add_argument(
+        "--tile-batch",
+        type=int,
+        default=TILE_BATCH,
+        help="Ventanas enviadas a YOLO en una sola llamada",
+    )
+    parser.add_argument(
+        "--motion-gate",
+        action="store_true",
+        help="En tiempo real, solo detecta cuando la escena cambia",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Mide el tiempo de cada etapa y muestra un resumen al terminar",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Guarda la medición en formato Chrome Trace (JSON)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="Formato de los resultados (por defecto jsonl o la extensión de --output)",
+    )
+    parser.add_argument(
+        "--no-images",
+        action="store_true",
+        help="No guarda las imágenes anotadas, solo los resultados estructurados",
+    )
+    parser.add_argument(
+        "--image-format",
+        choices=IMAGE_FORMATS,
+        default=IMAGE_FORMAT,
+        help="Formato de las imágenes anotadas",
+    )
+    parser.add_argument(
+        "--image-quality",
+        type=int,
+        default=IMAGE_QUALITY,
+        help="Calidad de compresión JPEG/WebP (1-100)",
+    )
+    parser.add_argument(
+        "--crops-only",
+        action="store_true",
+        help="Guarda solo el recorte de cada matrícula, no la imagen completa",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="No reutiliza ni guarda resultados de imágenes ya procesadas",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=Path,
+        default=CACHE_PATH,
+        help="Archivo SQLite de la caché de resultados",
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=float,
+        default=CACHE_MAX_BYTES / 1024 / 1024,
+        help="Tamaño máximo de la caché; se borran primero los menos usados",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Procesa una carpeta de imágenes sin interfaz interactiva"
+    )
+    batch_parser.add_argument("path", type=Path, help="Carpeta con imágenes")
+    batch_parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Archivo de resultados (.jsonl, .csv o .parquet)",
+    )
+    batch_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="Imágenes por llamada al modelo YOLO",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=PREFETCH_WORKERS,
+        help="Hilos de decodificación de imágenes",
+    )
+    batch_parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Procesos que ejecutan los modelos en paralelo (útil sin GPU)",
+    )
+    batch_parser.add_argument(
+        "--threads-per-process",
+        type=int,
+        default=None,
+        help="Hilos de torch/OpenCV por proceso (por defecto, núcleos / procesos)",
+    )
+    batch_parser.add_argument(
+        "--shared-memory",
+        action="store_true",
+        help="Decodifica en el proceso principal y comparte las imágenes por memoria",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Mantiene los modelos cargados y atiende peticiones HTTP"
+    )
+    serve_parser.add_argument("--host", type=str, default=SERVE_HOST)
+    serve_parser.add_argument("--port", type=int, default=SERVE_PORT)
+    serve_parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Escucha en un socket Unix en lugar de TCP",
+    )
+    serve_parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=SERVE_MAX_BATCH,
+        help="Peticiones agrupadas como máximo en una inferencia",
+    )
+    serve_parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=SERVE_BATCH_WINDOW * 1000,
+        help="Milisegundos que se esperan peticiones para formar un lote",
+    )
+    serve_parser.add_argument(
+        "--max-body-mb",
+        type=float,
+        default=SERVE_MAX_BODY / 1024 / 1024,
+        help="Tamaño máximo de la imagen de una petición; las mayores reciben 413",
+    )
+
+    camera_parser = subparsers.add_parser(
+        "camera", help="Detecta en tiempo real sobre una o más fuentes de video"
+    )
+    camera_parser.add_argument(
+        "--source",
+        type=CameraSource.parse,
+        action="append",
+        default=None,
+        metavar="FUENTE[;roi=X_MIN,Y_MIN,X_MAX,Y_MAX][;imgsz=N]",
+        help="Índice de cámara, archivo de video o URL RTSP/HTTP, con su región "
+        "de interés y resolución opcionales. Se puede repetir",
+    )
+
+    cache_parser = subparsers.add_parser(
+        "cache", help="Administra la caché de resultados"
+    )
+    cache_parser.add_argument(
+        "action",
+        choices=("clear", "info"),
+        help="clear invalida todos los resultados; info muestra el tamaño",
+    )
+
+    args = parser.parse_args()
+
+    # Se valida antes de cargar los modelos, no al abrir el archivo
+    if (
+        args.int8
+        and args.detector_backend == "openvino"
+        and args.calibration_data is None
+    ):
+        parser.error(
+            "--int8 con OpenVINO requiere --calibration-data: sin él se calibra "
+            "con COCO en lugar de matrículas"
+        )
+
+    output_format = args.format
+    if getattr(args, "output", None) is not None:
+        try:
+            output_format = resolve_format(args.output, args.format)
+        except ValueError as error:
+            parser.error(str(error))
+    if output_format == "parquet" and find_spec("pyarrow") is None:
+        parser.error(
+            "El formato parquet requiere pyarrow: pip install plate-cli[parquet]"
+        )
+
+    return args
+
+
 def main():
-    app = App()
-    app.run()
+    args = parse_args()
+
+    if args.profile or args.profile_output:
+        profiler.enable()
+
+    # Con varios procesos cada uno carga sus modelos; el principal solo coordina
+    pooled = args.command == "batch" and args.processes > 1
+
+    models = Models(
+        preprocess_profile=args.preprocess,
+        country_profiles=args.country_profiles,
+        roi=args.roi,
+        imgsz=args.imgsz,
+        ocr_mode=args.ocr_mode,
+        low_memory=args.ocr_low_memory,
+        detector_backend=args.detector_backend,
+        int8=args.int8,
+        calibration_data=args.calibration_data,
+        device=args.device,
+        threads=args.threads,
+        cascade=args.ocr_cascade,
+        tile_size=args.tile_size,
+        tile_overlap=args.tile_overlap,
+        tile_batch=args.tile_batch,
+    )
+
+    cache = None
+    if not args.no_cache:
+        from plate_cli.cache import ResultCache
+
+        cache = ResultCache(
+            args.cache_path,
+            int(args.cache_size_mb * 1024 * 1024),
+            models,
+        )
+
+    app = App(
+        models,
+        preload=not pooled and args.command != "cache",
+        cache=cache,
+        output_format=args.format,
+        save_images=not args.no_images,
+        image_format=args.image_format,
+        image_quality=args.image_quality,
+        crops_only=args.crops_only,
+        motion_gate=args.motion_gate,
+    )
+
+    try:
+        if args.command == "batch":
+            app.run_batch(
+                args.path,
+                args.output,
+                args.batch_size,
+                args.workers,
+                args.processes,
+                args.threads_per_process,
+                args.shared_memory,
+            )
+        elif args.command == "camera":
+            app.run_camera(args.source)
+        elif args.command == "cache":
+            if args.action == "clear":
+                app.clear_cache()
+            else:
+                app.cache_info()
+        elif args.command == "serve":
+            app.run_server(
+                args.host,
+                args.port,
+                args.socket,
+                args.max_batch,
+                args.batch_window_ms / 1000,
+                int(args.max_body_mb * 1024 * 1024),
+            )
+        else:
+            app.run()
+    finally:
+        if profiler.enabled:
+            app.print_profile(args.profile_output)
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -1,63 +1,548 @@
-from typing import Any, List, cast
-
-import easyocr
-import numpy as np
-from cv2.typing import MatLike
-from easyocr.easyocr import Reader
-from PIL.Image import Image
-from PIL.ImageFile import ImageFile
-from ultralytics.engine.results import Boxes, Results
-from ultralytics.models import YOLO
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Tuple, cast
 
 from plate_cli.constants import (
+    CASCADE_MIN_CONFIDENCE,
+    CASCADE_PROFILE,
+    COLOR_ORDER,
     CONF_THRESHOLD,
+    DETECTOR_BACKEND,
+    DEVICE,
     NMS_THRESHOLD,
-    OCR_BLOCKLIST,
+    OCR_ALLOWLIST,
+    OCR_BATCH_SIZE,
+    OCR_LANGUAGES,
+    OCR_MODE,
+    PREPROCESS_PROFILE,
+    SCHEDULER_MAX_BATCH,
+    SCHEDULER_MAX_WAIT,
+    TILE_BATCH,
+    TILE_OVERLAP,
     YOLO_MODEL_PATH,
 )
-from plate_cli.utils.normalize import normalize_text
-from plate_cli.utils.preprocess_image import preprocess_image
+from plate_cli.profiler import profiler
+from plate_cli.scheduler import BatchScheduler
+from plate_cli.utils.normalize import is_valid_plate, normalize_text
+from plate_cli.utils.roi import RegionOfInterest, to_full_frame
+
+# ultralytics, easyocr, torch y cv2 tardan segundos en importarse, así que solo
+# se cargan al usar los modelos
+if TYPE_CHECKING:
+    import numpy as np
+    from cv2.typing import MatLike
+    from easyocr.easyocr import Reader
+    from numpy.typing import NDArray
+    from ultralytics.engine.results import Boxes, Results
+    from ultralytics.models import YOLO
+
+
+class Detection(NamedTuple):
+    country: str
+    text: str
+    confidence: float
+    bbox: Tuple[int, int, int, int]
+
+
+def crop_box(image: MatLike, bbox: Tuple[float, float, float, float]) -> MatLike:
+    """Recorte de la caja, ajustado a los bordes de la imagen. Es una vista:
+    dibujar sobre la imagen también cambia el recorte."""
+    height, width = image.shape[:2]
+    x_min, y_min, x_max, y_max = bbox
+    return image[
+        max(0, int(y_min)) : min(height, int(y_max)),
+        max(0, int(x_min)) : min(width, int(x_max)),
+    ]
 
 
 class Models:
-    def __init__(self) -> None:
-        self.yolo: YOLO | None = None
-        self.reader: Reader | None = None
+    """YOLO y el OCR. Las imágenes son arreglos NumPy en orden BGR, el mismo que
+    usan OpenCV y ultralytics, así que no hace falta convertirlas."""
+
+    def __init__(
+        self,
+        preprocess_profile: str = PREPROCESS_PROFILE,
+        country_profiles: Path | None = None,
+        roi: RegionOfInterest | None = None,
+        imgsz: int | None = None,
+        ocr_mode: str = OCR_MODE,
+        low_memory: bool = False,
+        detector_backend: str = DETECTOR_BACKEND,
+        int8: bool = False,
+        calibration_data: Path | None = None,
+        device: str = DEVICE,
+        threads: int | None = None,
+        cascade: bool = False,
+        tile_size: int | None = None,
+        tile_overlap: float = TILE_OVERLAP,
+        tile_batch: int = TILE_BATCH,
+    ) -> None:
+        self._yolo: YOLO | None = None
+        self._reader: Reader | None = None
+        self._loading: Dict[str, Future[None]] = {}
+        self.preprocess_profile = preprocess_profile
+        self.country_profiles = country_profiles
+        # Región y resolución de inferencia por defecto; cada llamada puede
+        # indicar las suyas (por ejemplo, una por cámara)
+        self.roi = roi
+        self.imgsz = imgsz
+        # "detect" corre el detector CRAFT de EasyOCR sobre cada recorte;
+        # "recognize" separa las líneas por proyección y solo usa el reconocedor.
+        # Sin el detector cargado (low_memory) solo es posible "recognize"
+        self.low_memory = low_memory
+        self.ocr_mode = "recognize" if low_memory else ocr_mode
+        # Backend pedido ("auto" se resuelve al cargar) y el que quedó en uso
+        self.detector_backend = detector_backend
+        self.int8 = int8
+        self.calibration_data = calibration_data
+        self.backend: str | None = None
+        self._detector_weights: Path | None = None
+        # Dispositivo pedido ("auto" se resuelve al cargar). En CPU torch usa
+        # `threads` hilos (None: su valor por defecto)
+        self.device = device
+        self.threads = threads
+        self._device: str | None = None
+        # Caracteres del reconocedor fuera de OCR_ALLOWLIST
+        self._ignore_chars = ""
+        # En cascada cada recorte se lee primero con CASCADE_PROFILE y solo se
+        # repite con `preprocess_profile` si la lectura no convence.
+        # cascade_stats cuenta cuántos se resolvieron en cada etapa
+        self.cascade = cascade
+        self.cascade_stats = {"light": 0, "heavy": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        # Con tile_size YOLO recorre ventanas solapadas de ese tamaño, de a
+        # tile_batch por llamada, y las detecciones se unen por NMS
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_batch = max(1, tile_batch)
+        self.scheduler: BatchScheduler[MatLike, Results] | None = None
+        self._scheduler_lock = threading.Lock()
+        # La carga en segundo plano y la caché piden los pesos a la vez
+        self._weights_lock = threading.Lock()
+
+    def options(self) -> Dict[str, Any]:
+        """Argumentos para construir otra instancia equivalente (por ejemplo, en
+        otro proceso). También definen qué resultados puede reutilizar la caché.
+        Los hilos no se incluyen: no cambian el resultado y cada proceso del pool
+        fija los suyos."""
+        return {
+            "preprocess_profile": self.preprocess_profile,
+            "country_profiles": self.country_profiles,
+            "roi": self.roi,
+            "imgsz": self.imgsz,
+            "ocr_mode": self.ocr_mode,
+            "low_memory": self.low_memory,
+            "detector_backend": self.detector_backend,
+            "int8": self.int8,
+            "calibration_data": self.calibration_data,
+            "device": self.device,
+            "cascade": self.cascade,
+            "tile_size": self.tile_size,
+            "tile_overlap": self.tile_overlap,
+            "tile_batch": self.tile_batch,
+        }
+
+    @property
+    def uses_cascade(self) -> bool:
+        """Con el perfil ligero como perfil principal la cascada leería dos
+        veces lo mismo."""
+        return self.cascade and self.preprocess_profile != CASCADE_PROFILE
+
+    def resolve_device(self) -> str:
+        """Elige el dispositivo y, en CPU, fija los hilos de torch."""
+        if self._device is None:
+            import torch
+
+            device = self.device
+            if device == "auto":
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+            if device == "cpu" and self.threads is not None:
+                torch.set_num_threads(self.threads)
+            self._device = device
+        return self._device
+
+    def describe(self) -> str:
+        """Configuración en uso, para mostrarla al terminar de cargar."""
+        import torch
+
+        device = self.resolve_device()
+        parts = [device]
+        if device == "cpu":
+            parts.append(f"{torch.get_num_threads()} hilos")
+        parts.append(f"detector {self.backend or self.detector_backend}")
+        if self.int8:
+            parts[-1] += " INT8"
+        ocr = f"OCR {self.ocr_mode}"
+        if device == "cpu":
+            # EasyOCR cuantiza el reconocedor a INT8 en CPU
+            ocr += " INT8"
+        if self.uses_cascade:
+            ocr += " en cascada"
+        parts.append(ocr)
+        return ", ".join(parts)
+
+    @property
+    def yolo(self) -> YOLO | None:
+        self._wait("yolo")
+        return self._yolo
+
+    @property
+    def reader(self) -> Reader | None:
+        self._wait("reader")
+        return self._reader
+
+    @property
+    def ready(self) -> bool:
+        return all(future.done() for future in self._loading.values())
+
+    @property
+    def loaded(self) -> bool:
+        """Terminaron las cargas en segundo plano y ninguna falló."""
+        return self.ready and all(
+            future.exception() is None for future in self._loading.values()
+        )
+
+    def detector_weights(self) -> Path:
+        """Elige el backend del detector y devuelve sus pesos, convirtiéndolos la
+        primera vez. Llamarlo antes de repartir el trabajo entre procesos evita
+        que cada uno exporte el mismo modelo."""
+        with self._weights_lock:
+            if self._detector_weights is None:
+                from plate_cli.detector import export_weights, resolve_backend
+
+                self.backend = resolve_backend(
+                    self.detector_backend, self.int8, self.resolve_device() == "cuda"
+                )
+                self._detector_weights = export_weights(
+                    self.backend, self.int8, YOLO_MODEL_PATH, self.calibration_data
+                )
+            return self._detector_weights
 
     def load_yolo(self) -> None:
-        self.yolo = YOLO(YOLO_MODEL_PATH)
+        with profiler.stage("load_yolo"):
+            from ultralytics.models import YOLO
+
+            self._yolo = YOLO(self.detector_weights(), task="detect")
 
     def load_reader(self) -> None:
-        self.reader = easyocr.Reader(["es", "pt"], gpu=True, verbose=False)
+        with profiler.stage("load_reader"):
+            import easyocr
+
+            from plate_cli.utils.preprocess_image import load_profiles
+
+            load_profiles(self.country_profiles)
+            # En CPU EasyOCR ya cuantiza el reconocedor a INT8 (quantize=True
+            # por defecto); con gpu explícito no advierte al elegir dispositivo
+            reader = easyocr.Reader(
+                OCR_LANGUAGES,
+                gpu=self.resolve_device() == "cuda",
+                verbose=False,
+                detector=not self.low_memory,
+            )
+            self._ignore_chars = "".join(set(reader.character) - set(OCR_ALLOWLIST))
+            self._reader = reader
+
+    def load_async(self) -> None:
+        """Carga YOLO y el OCR en paralelo en segundo plano."""
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="load")
+        self._loading = {
+            "yolo": executor.submit(self.load_yolo),
+            "reader": executor.submit(self.load_reader),
+        }
+        executor.shutdown(wait=False)
 
-    def inference(self, image: ImageFile | MatLike, **kwargs: Any) -> List[Results]:
-        if self.yolo is None:
+    def wait(self) -> None:
+        """Bloquea hasta que terminen las cargas pendientes."""
+        for name in list(self._loading):
+            self._wait(name)
+
+    def _wait(self, name: str) -> None:
+        future = self._loading.get(name)
+        if future is not None:
+            # Propaga los errores de carga al primer uso del modelo
+            future.result()
+
+    def inference(
+        self,
+        image: MatLike | List[MatLike],
+        roi: RegionOfInterest | None = None,
+        imgsz: int | None = None,
+        **kwargs: Any,
+    ) -> List[Results]:
+        """Detecta matrículas. Con una región de interés solo se envía a YOLO ese
+        recorte, y con `tile_size` se recorre en ventanas; en ambos casos las
+        cajas se devuelven en coordenadas del frame completo."""
+        yolo = self.yolo
+        if yolo is None:
             raise RuntimeError("El modelo YOLO no ha sido cargado.")
-        results = cast(
-            List[Results],
-            self.yolo(
-                image, verbose=False, conf=CONF_THRESHOLD, iou=NMS_THRESHOLD, **kwargs
-            ),
-        )
+
+        frames = image if isinstance(image, list) else [image]
+        roi = roi or self.roi
+        imgsz = imgsz or self.imgsz
+        if imgsz is not None:
+            kwargs["imgsz"] = imgsz
+        if self.backend == "torch":
+            kwargs.setdefault("device", self.resolve_device())
+
+        crops = [roi.crop(frame) for frame in frames] if roi is not None else []
+        sources = [crop for crop, _ in crops] if crops else frames
+
+        with profiler.stage("inference"):
+            if self.tile_size is not None:
+                results = self._tiled_inference(yolo, sources, **kwargs)
+            else:
+                results = cast(
+                    "List[Results]",
+                    yolo(
+                        sources,
+                        verbose=False,
+                        conf=CONF_THRESHOLD,
+                        iou=NMS_THRESHOLD,
+                        **kwargs,
+                    ),
+                )
+
+        if crops:
+            results = [
+                to_full_frame(result, frame, offset)
+                for result, frame, (_, offset) in zip(results, frames, crops)
+            ]
+
         return results
 
-    def get_text_from_image(self, image: Image, box: Boxes, country: str) -> str:
-        x_min, y_min, x_max, y_max = cast(List[float], box.xyxy[0].tolist())  # type: ignore
-        crop = image.crop((x_min, y_min, x_max, y_max))
-        np_crop = np.array(crop)
+    def _tiled_inference(
+        self, yolo: YOLO, images: List[MatLike], **kwargs: Any
+    ) -> List[Results]:
+        """Corre YOLO sobre las ventanas de todas las imágenes en lotes de
+        `tile_batch` y arma un resultado por imagen."""
+        from plate_cli.utils.tiles import merge_tiles, tile_image
 
-        preprocessed = preprocess_image(np_crop, country)
+        size = cast(int, self.tile_size)
+        # Cada ventana entra a YOLO sin reducirse
+        kwargs.setdefault("imgsz", size)
 
-        text = self.reader.readtext(  # type: ignore
-            preprocessed,
-            detail=0,
-            paragraph=True,
-            blocklist=OCR_BLOCKLIST,
-        )
+        tiles = [tile_image(image, size, self.tile_overlap) for image in images]
+        flat = [tile for image_tiles in tiles for tile, _ in image_tiles]
+
+        tile_results: List[Results] = []
+        for start in range(0, len(flat), self.tile_batch):
+            tile_results += cast(
+                "List[Results]",
+                yolo(
+                    flat[start : start + self.tile_batch],
+                    verbose=False,
+                    conf=CONF_THRESHOLD,
+                    iou=NMS_THRESHOLD,
+                    **kwargs,
+                ),
+            )
+
+        with profiler.stage("merge_tiles"):
+            results: List[Results] = []
+            position = 0
+            for image, image_tiles in zip(images, tiles):
+                end = position + len(image_tiles)
+                results.append(
+                    merge_tiles(
+                        tile_results[position:end],
+                        [offset for _, offset in image_tiles],
+                        image,
+                    )
+                )
+                position = end
+
+        return results
+
+    def start_scheduler(
+        self,
+        max_batch_size: int = SCHEDULER_MAX_BATCH,
+        max_wait: float = SCHEDULER_MAX_WAIT,
+    ) -> BatchScheduler[MatLike, Results]:
+        """Crea el planificador que agrupa las imágenes de `inference_async`."""
+        with self._scheduler_lock:
+            if self.scheduler is None:
+                self.scheduler = BatchScheduler(
+                    self.inference, max_batch_size, max_wait
+                )
+            return self.scheduler
+
+    def inference_async(
+        self,
+        image: MatLike,
+        roi: RegionOfInterest | None = None,
+        imgsz: int | None = None,
+    ) -> Future[Results]:
+        """Encola la imagen para inferirla en el mismo lote que las de otros hilos.
+        Solo comparten lote las imágenes con la misma región y resolución."""
+        return self.start_scheduler().submit(image, roi=roi, imgsz=imgsz)
+
+    def read_plates(self, image: MatLike, result: Results) -> List[Detection]:
+        return self.read_plates_batch([image], [result])[0]
+
+    def read_plates_batch(
+        self, images: List[MatLike], results: List[Results]
+    ) -> List[List[Detection]]:
+        """Lee todas las matrículas de varias imágenes con una sola pasada del OCR."""
+        items: List[Tuple[MatLike, Boxes, str]] = []
+        owners: List[int] = []
+
+        for index, (image, result) in enumerate(zip(images, results)):
+            if not result.boxes:
+                continue
+            for box in result.boxes:
+                items.append((image, box, result.names[int(box.cls.item())]))
+                owners.append(index)
+
+        texts = self.get_texts_from_images(items)
+
+        detections: List[List[Detection]] = [[] for _ in images]
+        for owner, (_, box, country), text in zip(owners, items, texts):
+            x_min, y_min, x_max, y_max = map(int, box.xyxy[0].tolist())
+            detections[owner].append(
+                Detection(
+                    country,
+                    text,
+                    round(float(box.conf.item()), 4),
+                    (x_min, y_min, x_max, y_max),
+                )
+            )
+
+        return detections
+
+    def get_text_from_image(self, image: MatLike, box: Boxes, country: str) -> str:
+        return self.get_texts_from_images([(image, box, country)])[0]
+
+    def get_texts_from_images(
+        self, items: List[Tuple[MatLike, Boxes, str]]
+    ) -> List[str]:
+        crops: List[MatLike] = []
+        for image, box, _ in items:
+            x_min, y_min, x_max, y_max = cast(List[float], box.xyxy[0].tolist())  # type: ignore
+            crops.append(crop_box(image, (x_min, y_min, x_max, y_max)))
+
+        return self.read_texts(crops, [country for _, _, country in items])
+
+    def read_texts(self, crops: List[MatLike], countries: List[str]) -> List[str]:
+        """Reconoce varios recortes con una sola pasada del reconocedor por etapa."""
+        if not self.uses_cascade:
+            readings = self._read_texts(crops, countries, self.preprocess_profile)
+            return [text for text, _ in readings]
+
+        with profiler.stage("ocr_cascade:light"):
+            readings = self._read_texts(crops, countries, CASCADE_PROFILE)
+
+        pending = [
+            index
+            for index, (text, confidence) in enumerate(readings)
+            if confidence < CASCADE_MIN_CONFIDENCE
+            or not is_valid_plate(text, countries[index])
+        ]
+
+        # Etapa de la que sale cada lectura final
+        stages = {"light": len(crops) - len(pending), "heavy": 0, "failed": 0}
+        if pending:
+            with profiler.stage("ocr_cascade:heavy"):
+                heavy = self._read_texts(
+                    [crops[index] for index in pending],
+                    [countries[index] for index in pending],
+                    self.preprocess_profile,
+                )
+            for index, reading in zip(pending, heavy):
+                if is_valid_plate(reading[0], countries[index]):
+                    readings[index] = reading
+                    stages["heavy"] += 1
+                elif is_valid_plate(readings[index][0], countries[index]):
+                    # La lectura ligera tenía formato válido aunque poca
+                    # confianza, y la completa no lo mejora
+                    stages["light"] += 1
+                else:
+                    # Ninguna etapa respeta el formato: se queda la lectura
+                    # completa, como sin cascada
+                    readings[index] = reading
+                    stages["failed"] += 1
+
+        with self._stats_lock:
+            for stage, count in stages.items():
+                self.cascade_stats[stage] += count
+
+        return [text for text, _ in readings]
+
+    def _read_texts(
+        self, crops: List[MatLike], countries: List[str], profile: str
+    ) -> List[Tuple[str, float]]:
+        """Texto normalizado y confianza mínima de sus regiones para cada recorte."""
+        reader = self.reader
+        if reader is None:
+            raise RuntimeError("El OCR no ha sido cargado.")
+
+        from easyocr.config import imgH
+        from easyocr.recognition import get_text
+        from easyocr.utils import get_image_list, get_paragraph, reformat_input
+
+        from plate_cli.utils.lines import split_lines
+        from plate_cli.utils.preprocess_image import preprocess_image
+
+        # Regiones de texto de todos los recortes y el recorte al que pertenecen
+        regions: List[Tuple[Any, NDArray[np.uint8]]] = []
+        owners: List[int] = []
+        max_width = 0
+
+        for index, (crop, country) in enumerate(zip(crops, countries)):
+            # Las etapas por recorte se separan por clase para comparar países
+            with profiler.stage(f"preprocess:{country}"):
+                preprocessed = preprocess_image(crop, country, profile, COLOR_ORDER)
+                img, img_cv_grey = reformat_input(preprocessed)
+
+            if self.ocr_mode == "recognize":
+                # YOLO ya ubicó la matrícula: basta con separar sus líneas
+                with profiler.stage(f"ocr_lines:{country}"):
+                    image_list, width = get_image_list(
+                        split_lines(img_cv_grey), [], img_cv_grey, model_height=imgH
+                    )
+            else:
+                with profiler.stage(f"ocr_detect:{country}"):
+                    horizontal_list, free_list = reader.detect(img, reformat=False)
+                    image_list, width = get_image_list(
+                        horizontal_list[0],
+                        free_list[0],
+                        img_cv_grey,
+                        model_height=imgH,
+                    )
+
+            regions += image_list
+            owners += [index] * len(image_list)
+            max_width = max(max_width, int(width))
+
+        grouped: List[List[Any]] = [[] for _ in crops]
 
-        if not text:
-            return ""
+        if regions:
+            with profiler.stage("ocr_recognize"):
+                recognized = get_text(
+                    reader.character,
+                    imgH,
+                    max_width,
+                    reader.recognizer,
+                    reader.converter,
+                    regions,
+                    self._ignore_chars,
+                    batch_size=OCR_BATCH_SIZE,
+                    workers=0,
+                    device=reader.device,
+                )
+            for owner, item in zip(owners, recognized):
+                grouped[owner].append(item)
 
-        normalized_text = normalize_text(cast(str, text[-1]), country)
+        readings: List[Tuple[str, float]] = []
+        for items, country in zip(grouped, countries):
+            # Equivalente a readtext(paragraph=True) quedándose con el último párrafo
+            paragraphs = get_paragraph(items) if items else []
+            if not paragraphs:
+                readings.append(("", 0.0))
+                continue
+            with profiler.stage(f"normalize:{country}"):
+                text = normalize_text(cast(str, paragraphs[-1][1]), country)
+            confidence = min(float(item[2]) for item in items)
+            readings.append((text, confidence))
 
-        return normalized_text
+        return readings
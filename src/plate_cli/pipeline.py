@@ -0,0 +1,282 @@
+import threading
+from collections import deque
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Callable, Deque, Generic, List, Tuple, TypeVar, cast
+
+import cv2
+from cv2.typing import MatLike
+from ultralytics.engine.results import Boxes
+
+from plate_cli.constants import OCR_QUEUE_SIZE, STREAM_STATS_SMOOTHING
+from plate_cli.models import Detection, Models
+from plate_cli.profiler import profiler
+from plate_cli.utils.motion import MotionGate
+from plate_cli.utils.roi import RegionOfInterest
+from plate_cli.utils.tracker import BBox, PlateTracker, Track
+
+T = TypeVar("T")
+
+# ID, país, matrícula, confianza y cantidad de lecturas de cada track
+TrackRow = Tuple[int, str, str, float, int]
+# Frame y momento en que se capturó
+Frame = Tuple[MatLike, float]
+
+
+def open_capture(source: str) -> cv2.VideoCapture:
+    """Abre un índice de dispositivo (`0`), un archivo de video o una URL
+    RTSP/HTTP."""
+    if source.isdigit():
+        return cv2.VideoCapture(int(source))
+    return cv2.VideoCapture(source)
+
+
+class StreamStats:
+    """FPS de captura y de detección, y latencia desde la captura hasta tener
+    las detecciones, suavizados con una media móvil exponencial."""
+
+    def __init__(self, smoothing: float = STREAM_STATS_SMOOTHING) -> None:
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._last_capture: float | None = None
+        self._last_detection: float | None = None
+        self.capture_fps = 0.0
+        self.detection_fps = 0.0
+        self.latency_ms = 0.0
+
+    def captured(self, now: float) -> None:
+        with self._lock:
+            if self._last_capture is not None and now > self._last_capture:
+                self.capture_fps = self._smooth(
+                    self.capture_fps, 1 / (now - self._last_capture)
+                )
+            self._last_capture = now
+
+    def detected(self, captured_at: float, now: float) -> None:
+        with self._lock:
+            if self._last_detection is not None and now > self._last_detection:
+                self.detection_fps = self._smooth(
+                    self.detection_fps, 1 / (now - self._last_detection)
+                )
+            self._last_detection = now
+            self.latency_ms = self._smooth(self.latency_ms, (now - captured_at) * 1000)
+
+    def snapshot(self) -> Tuple[float, float, float]:
+        with self._lock:
+            return self.capture_fps, self.detection_fps, self.latency_ms
+
+    def _smooth(self, current: float, value: float) -> float:
+        if current == 0:
+            return value
+        return current + self.smoothing * (value - current)
+
+
+class LatestValue(Generic[T]):
+    """Conserva solo el último valor publicado, descartando los anteriores."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._value: T | None = None
+        self._sequence = 0
+
+    def put(self, value: T) -> None:
+        with self._condition:
+            self._value = value
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def get(self, last_sequence: int, timeout: float) -> Tuple[int, T | None]:
+        """Espera un valor más nuevo que `last_sequence` o devuelve None."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._sequence > last_sequence, timeout=timeout
+            )
+            if self._sequence <= last_sequence:
+                return last_sequence, None
+            return self._sequence, self._value
+
+
+class DropOldestQueue(Generic[T]):
+    """Cola acotada que descarta el elemento más antiguo cuando está llena."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._items: Deque[T] = deque(maxlen=max(1, maxsize))
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item: T) -> None:
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float) -> T | None:
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._items) > 0, timeout):
+                return None
+            return self._items.popleft()
+
+
+class CameraPipeline:
+    """Captura, detección y OCR de una fuente en hilos separados del hilo de
+    visualización. Varias fuentes comparten los modelos a través del planificador
+    de `Models`: cada una espera el resultado de su frame antes de enviar otro,
+    así que los lotes toman como mucho un frame por fuente y ninguna acapara
+    el detector."""
+
+    def __init__(
+        self,
+        models: Models,
+        capture: cv2.VideoCapture,
+        ocr_queue_size: int = OCR_QUEUE_SIZE,
+        motion_gate: MotionGate | None = None,
+        name: str = "0",
+        roi: RegionOfInterest | None = None,
+        imgsz: int | None = None,
+    ) -> None:
+        self.models = models
+        self.capture = capture
+        self.motion_gate = motion_gate
+        self.name = name
+        # Región y resolución de esta fuente; None usa las de Models
+        self.roi = roi
+        self.imgsz = imgsz
+        self.stats = StreamStats()
+        self._last_frame = 0
+
+        # Los archivos de video se reproducen a su velocidad real en lugar de
+        # leerse tan rápido como se decodifican
+        fps = capture.get(cv2.CAP_PROP_FPS) if Path(name).is_file() else 0
+        self._frame_interval = 1 / fps if fps > 0 else 0.0
+        self._next_frame = 0.0
+
+        self.tracker = PlateTracker()
+        self._tracker_lock = threading.Lock()
+
+        self.frames: LatestValue[Frame] = LatestValue()
+        self.detections: LatestValue[List[Detection]] = LatestValue()
+        self.tracks: LatestValue[List[TrackRow]] = LatestValue()
+        self.ocr_queue: DropOldestQueue[Tuple[MatLike, List[Tuple[Boxes, Track]]]] = (
+            DropOldestQueue(ocr_queue_size)
+        )
+
+        self.stop_event = threading.Event()
+        self.threads = [
+            threading.Thread(
+                target=self._run_stage,
+                args=(stage,),
+                name=f"{stage.__name__.lstrip('_')}-{name}",
+                daemon=True,
+            )
+            for stage in (self._capture, self._detect, self._recognize)
+        ]
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+
+    @property
+    def running(self) -> bool:
+        return not self.stop_event.is_set()
+
+    def _run_stage(self, stage: Callable[[], None]) -> None:
+        try:
+            while self.running:
+                stage()
+        finally:
+            # Si una etapa termina o falla, se detiene todo el pipeline
+            self.stop_event.set()
+
+    def _capture(self) -> None:
+        if self._frame_interval:
+            sleep(max(0.0, self._next_frame - monotonic()))
+            self._next_frame = monotonic() + self._frame_interval
+
+        return_value, frame = self.capture.read()
+        if not return_value:
+            self.stop_event.set()
+            return
+
+        now = monotonic()
+        self.stats.captured(now)
+        self.frames.put((frame, now))
+
+    def _detect(self) -> None:
+        self._last_frame, item = self.frames.get(self._last_frame, timeout=0.1)
+        if item is None:
+            return
+
+        frame, captured_at = item
+
+        # Sin cambios en la escena se conservan las detecciones y los tracks
+        # anteriores: el tracker no avanza y no da por perdido a un vehículo quieto
+        if self.motion_gate is not None:
+            with profiler.stage("motion"):
+                if not self.motion_gate.should_detect(frame):
+                    return
+
+        result = self.models.inference_async(frame, self.roi, self.imgsz).result()
+        self.stats.detected(captured_at, monotonic())
+        boxes = list(result.boxes) if result.boxes else []
+
+        with self._tracker_lock:
+            tracks = self.tracker.update(
+                [
+                    (
+                        cast(BBox, tuple(map(int, box.xyxy[0].tolist()))),
+                        result.names[int(box.cls.item())],
+                        float(box.conf.item()),
+                    )
+                    for box in boxes
+                ]
+            )
+
+            # El OCR solo corre en tracks nuevos o cuando toca refinar la lectura
+            pending: List[Tuple[Boxes, Track]] = []
+            for box, track in zip(boxes, tracks):
+                if self.tracker.needs_ocr(track):
+                    track.last_ocr = self.tracker.frame
+                    pending.append((box, track))
+
+            self.detections.put(
+                [
+                    Detection(track.country, track.text, track.confidence, track.bbox)
+                    for track in tracks
+                ]
+            )
+            if pending:
+                self._publish_tracks()
+
+        if pending:
+            self.ocr_queue.put((frame, pending))
+
+    def _recognize(self) -> None:
+        item = self.ocr_queue.get(timeout=0.1)
+        if item is None:
+            return
+
+        frame, pending = item
+
+        # El OCR recorta vistas del frame BGR, sin convertirlo ni copiarlo
+        texts = self.models.get_texts_from_images(
+            [(frame, box, track.country) for box, track in pending]
+        )
+
+        with self._tracker_lock:
+            for (_, track), text in zip(pending, texts):
+                track.add_reading(text)
+            self._publish_tracks()
+
+    def _publish_tracks(self) -> None:
+        self.tracks.put(
+            [
+                (track.id, track.country, track.text, track.confidence, track.readings)
+                for track in self.tracker.tracks()
+            ]
+        )
@@ -0,0 +1,285 @@
+import os
+import weakref
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from plate_cli.batch import BatchProcessor, Cached, Decoded, iter_images
+from plate_cli.constants import BATCH_SIZE, CACHE_MAX_BYTES, PREFETCH_WORKERS
+from plate_cli.models import Models
+from plate_cli.profiler import profiler
+from plate_cli.writers import ResultWriter, open_writer
+
+Record = Dict[str, Any]
+# Resultados de un lote y los eventos del profiler del proceso que lo ejecutó
+BatchResult = Tuple[List[Record], List[Dict[str, Any]]]
+# Ruta, forma del arreglo y desplazamiento en la memoria compartida, o el error
+SharedEntry = Tuple[str, Tuple[int, ...], int, str | None]
+# Lote enviado a un proceso, su bloque de memoria compartida y los registros
+# que el coordinador ya resolvió con la caché, por posición en el lote
+PendingBatch = Tuple[Future[BatchResult], SharedMemory | None, Dict[int, Record]]
+
+_processor: BatchProcessor | None = None
+# Bloques de memoria compartida abiertos en el proceso y las vistas creadas
+# sobre cada uno
+_open_blocks: List[Tuple[SharedMemory, List[weakref.ref[Any]]]] = []
+
+_THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@contextmanager
+def _thread_environment(threads: int) -> Iterator[None]:
+    """Fija los hilos de OpenMP/BLAS para los procesos que se creen dentro.
+    Los procesos `spawn` heredan el entorno del coordinador y lo leen al
+    importar numpy, cv2 y torch, antes de que corra `_init_worker`."""
+    previous = {variable: os.environ.get(variable) for variable in _THREAD_VARIABLES}
+    os.environ.update({variable: str(threads) for variable in _THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+def _init_worker(
+    models_options: Dict[str, Any],
+    threads: int,
+    batch_size: int,
+    cache_path: Path | None,
+    cache_max_bytes: int,
+    profile_origin: float | None,
+) -> None:
+    """Carga los modelos una vez por proceso con los hilos de torch/OpenCV fijados."""
+    global _processor
+
+    if profile_origin is not None:
+        profiler.enable(profile_origin)
+
+    import cv2
+    import torch
+
+    cv2.setNumThreads(threads)
+    torch.set_num_threads(threads)
+
+    models = Models(**models_options, threads=threads)
+    models.load_yolo()
+    models.load_reader()
+
+    cache = None
+    if cache_path is not None:
+        from plate_cli.cache import ResultCache
+
+        # Todos los procesos comparten el mismo archivo SQLite
+        cache = ResultCache(cache_path, cache_max_bytes, models)
+
+    _processor = BatchProcessor(models, batch_size, cache=cache)
+
+
+def _process_paths(paths: List[str]) -> BatchResult:
+    if _processor is None:
+        raise RuntimeError("El proceso no fue inicializado.")
+
+    batch: List[Decoded] = [_processor.load(Path(path)) for path in paths]
+    return _processor.process_batch(batch), profiler.drain()
+
+
+def _process_shared(name: str, entries: List[SharedEntry]) -> BatchResult:
+    if _processor is None:
+        raise RuntimeError("El proceso no fue inicializado.")
+
+    import numpy as np
+
+    _release_blocks()
+    shared = SharedMemory(name=name)
+    views: List[weakref.ref[Any]] = []
+    _open_blocks.append((shared, views))
+
+    # Las imágenes se leen directamente del bloque, sin copiarlas: el
+    # coordinador lo libera recién cuando recibe el resultado
+    batch: List[Decoded] = []
+    for path, shape, offset, error in entries:
+        if error is not None:
+            batch.append((Path(path), OSError(error)))
+            continue
+        view = np.ndarray(shape, np.uint8, shared.buf, offset)
+        views.append(weakref.ref(view))
+        batch.append((Path(path), view))
+        del view
+
+    records = _processor.process_batch(batch)
+    # Sin el lote el bloque se puede cerrar, salvo que el modelo retenga vistas
+    del batch
+    _release_blocks()
+    return records, profiler.drain()
+
+
+def _release_blocks() -> None:
+    """Cierra los bloques sin vistas vivas. Cerrar uno con vistas las dejaría
+    apuntando a memoria liberada, y ultralytics conserva el último lote: su
+    bloque se cierra recién en la llamada siguiente. Los recortes y demás
+    vistas derivadas mantienen viva a la vista original."""
+    for entry in list(_open_blocks):
+        block, views = entry
+        if any(view() is not None for view in views):
+            continue
+        block.close()
+        _open_blocks.remove(entry)
+
+
+class ProcessBatchRunner:
+    """Reparte los lotes de una carpeta entre procesos y une los resultados en
+    orden."""
+
+    def __init__(
+        self,
+        processes: int,
+        models_options: Dict[str, Any] | None = None,
+        threads: int | None = None,
+        batch_size: int = BATCH_SIZE,
+        shared_memory: bool = False,
+        decode_workers: int = PREFETCH_WORKERS,
+        cache_path: Path | None = None,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+    ) -> None:
+        self.processes = max(1, processes)
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.processes)
+        self.batch_size = max(1, batch_size)
+        # Opciones de Models con las que cada proceso construye los suyos
+        self.models_options = models_options or {}
+        self.shared_memory = shared_memory
+        self.decode_workers = max(1, decode_workers)
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+
+    def run(
+        self, path: Path, output_path: Path, output_format: str | None = None
+    ) -> int:
+        processed = 0
+        models = Models(**self.models_options)
+        # Convierte los pesos del detector una sola vez, antes de los procesos
+        models.detector_weights()
+
+        cache = None
+        if self.shared_memory and self.cache_path is not None:
+            from plate_cli.cache import ResultCache
+
+            # Con memoria compartida el coordinador decodifica: consulta la
+            # caché antes, para no decodificar ni enviar los aciertos
+            cache = ResultCache(self.cache_path, self.cache_max_bytes, models)
+        loader = BatchProcessor(models, self.batch_size, cache=cache)
+
+        pending: Deque[PendingBatch] = deque()
+        # Lotes en vuelo: suficientes para no dejar procesos ociosos
+        window = self.processes * 2
+
+        with (
+            _thread_environment(self.threads),
+            open_writer(output_path, output_format) as writer,
+            ThreadPoolExecutor(self.decode_workers) as decoder,
+            ProcessPoolExecutor(
+                self.processes,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self.models_options,
+                    self.threads,
+                    self.batch_size,
+                    self.cache_path,
+                    self.cache_max_bytes,
+                    # Los procesos miden sus etapas y las envían con cada lote
+                    profiler.origin if profiler.enabled else None,
+                ),
+            ) as executor,
+        ):
+            for chunk in self._chunks(iter_images(path)):
+                pending.append(self._submit(executor, decoder, loader, chunk))
+                if len(pending) >= window:
+                    processed += self._write(*pending.popleft(), writer)
+
+            while pending:
+                processed += self._write(*pending.popleft(), writer)
+
+        if cache is not None:
+            cache.close()
+
+        return processed
+
+    def _chunks(self, paths: Iterator[Path]) -> Iterator[List[Path]]:
+        while chunk := list(islice(paths, self.batch_size)):
+            yield chunk
+
+    def _submit(
+        self,
+        executor: ProcessPoolExecutor,
+        decoder: ThreadPoolExecutor,
+        loader: BatchProcessor,
+        chunk: List[Path],
+    ) -> PendingBatch:
+        if not self.shared_memory:
+            return executor.submit(_process_paths, [str(p) for p in chunk]), None, {}
+
+        import numpy as np
+
+        decoded = list(decoder.map(loader.load, chunk))
+        hits = {
+            index: loader.process_batch([item])[0]
+            for index, item in enumerate(decoded)
+            if isinstance(item[1], Cached)
+        }
+        arrays = [
+            image for _, image in decoded if not isinstance(image, (Exception, Cached))
+        ]
+
+        if len(hits) == len(decoded):
+            # Todo el lote salió de la caché: no hay nada que enviar
+            done: Future[BatchResult] = Future()
+            done.set_result(([], []))
+            return done, None, hits
+
+        shared = SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arrays)))
+        entries: List[SharedEntry] = []
+        offset = 0
+
+        for path, image in decoded:
+            if isinstance(image, Cached):
+                continue
+            if isinstance(image, Exception):
+                entries.append((str(path), (), 0, str(image)))
+                continue
+            np.ndarray(image.shape, np.uint8, shared.buf, offset)[:] = image
+            entries.append((str(path), image.shape, offset, None))
+            offset += image.nbytes
+
+        return executor.submit(_process_shared, shared.name, entries), shared, hits
+
+    def _write(
+        self,
+        future: Future[BatchResult],
+        shared: SharedMemory | None,
+        hits: Dict[int, Record],
+        writer: ResultWriter,
+    ) -> int:
+        try:
+            records, events = future.result()
+        finally:
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+
+        profiler.merge(events)
+        # Los aciertos de la caché vuelven a su lugar dentro del lote
+        computed = iter(records)
+        total = len(records) + len(hits)
+        for index in range(total):
+            writer.write(hits[index] if index in hits else next(computed))
+        writer.flush()
+
+        return total
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Generator, List, Tuple
+
+# Nombre, cantidad, total (s), p50, p95 y p99 (ms) de cada etapa
+StageSummary = Tuple[str, int, float, float, float, float]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Profiler:
+    """Registra el tiempo de cada etapa del pipeline. Desactivado no hace nada."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        # Referencia de los tiempos de la traza. perf_counter usa un reloj
+        # monótono de todo el sistema, así que sirve también entre procesos
+        self.origin = perf_counter()
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._events: List[Dict[str, Any]] = []
+
+    def enable(self, origin: float | None = None) -> None:
+        """`origin` alinea la traza de un proceso hijo con la del coordinador."""
+        self.enabled = True
+        self.origin = perf_counter() if origin is None else origin
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._events.clear()
+            self.origin = perf_counter()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Entrega los eventos registrados y los olvida. Los procesos del pool
+        los envían así al coordinador junto con cada lote."""
+        with self._lock:
+            events = self._events
+            self._events = []
+            self._samples.clear()
+        return events
+
+    def merge(self, events: List[Dict[str, Any]]) -> None:
+        """Agrega los eventos de otro proceso, ya alineados con `origin`."""
+        with self._lock:
+            for event in events:
+                self._samples[event["name"]].append(event["dur"] / 1e6)
+                self._events.append(event)
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, perf_counter())
+
+    def record(self, name: str, start: float, end: float) -> None:
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        with self._lock:
+            self._samples[name].append(end - start)
+            self._events.append(event)
+
+    def summary(self) -> List[StageSummary]:
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+
+        return [
+            (
+                name,
+                len(values),
+                sum(values),
+                percentile(values, 50) * 1000,
+                percentile(values, 95) * 1000,
+                percentile(values, 99) * 1000,
+            )
+            for name, values in sorted(samples.items())
+        ]
+
+    def dump(self, path: Path) -> None:
+        """Guarda los eventos en formato Chrome Trace (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self._events)
+
+        stages = {
+            name: {
+                "count": count,
+                "total_s": total,
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+            }
+            for name, count, total, p50, p95, p99 in self.summary()
+        }
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "otherData": {"stages": stages}}, f)
+
+
+profiler = Profiler()
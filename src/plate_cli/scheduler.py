@@ -0,0 +1,149 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Generic, List, Tuple, TypeVar
+
+from plate_cli.constants import SCHEDULER_MAX_BATCH, SCHEDULER_MAX_WAIT
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Opciones del pedido como tuplas (nombre, valor), ordenadas
+_Options = Tuple[Tuple[str, Any], ...]
+# Elemento, futuro del llamador, momento en que entró a la cola y opciones
+_Request = Tuple[T, Future[R], float, _Options]
+
+
+class BatchScheduler(Generic[T, R]):
+    """Agrupa pedidos concurrentes en lotes por tamaño máximo o tiempo de espera
+    máximo, y procesa cada lote con una sola llamada a `handler`. Los pedidos
+    con opciones distintas (por ejemplo, otra región de interés) van en lotes
+    separados, y las opciones se pasan a `handler` como argumentos con nombre."""
+
+    def __init__(
+        self,
+        handler: Callable[..., List[R]],
+        max_batch_size: int = SCHEDULER_MAX_BATCH,
+        max_wait: float = SCHEDULER_MAX_WAIT,
+    ) -> None:
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+
+        self._queue: queue.Queue[_Request[T, R] | None] = queue.Queue()
+        # Pedidos que llegaron mientras se armaba un lote de otras opciones
+        self._deferred: Deque[_Request[T, R]] = deque()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._wait_total = 0.0
+        self._max_queue_depth = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T, **options: Any) -> Future[R]:
+        """Encola `item`; las opciones deben ser hashables."""
+        future: Future[R] = Future()
+        self._queue.put((item, future, monotonic(), tuple(sorted(options.items()))))
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() + len(self._deferred)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            batches = self._batches
+            items = self._items
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "batches": batches,
+                "items": items,
+                "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+                "mean_wait_ms": round(self._wait_total / items * 1000, 3)
+                if items
+                else 0.0,
+            }
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(
+        self, first: _Request[T, R], closing: bool
+    ) -> Tuple[List[_Request[T, R]], bool]:
+        """Junta pedidos con las mismas opciones que el primero hasta llenar el
+        lote o agotar su espera. Los demás quedan para los lotes siguientes."""
+        batch = [first]
+        options = first[3]
+        deadline = first[2] + self.max_wait
+
+        for request in list(self._deferred):
+            if len(batch) >= self.max_batch_size:
+                return batch, closing
+            if request[3] == options:
+                self._deferred.remove(request)
+                batch.append(request)
+
+        # Tras el cierre ya no llegan pedidos nuevos
+        while not closing and len(batch) < self.max_batch_size:
+            remaining = deadline - monotonic()
+            try:
+                request = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            if request[3] == options:
+                batch.append(request)
+            else:
+                self._deferred.append(request)
+
+        return batch, closing
+
+    def _run(self) -> None:
+        closing = False
+        while True:
+            if self._deferred:
+                first = self._deferred.popleft()
+            elif closing:
+                return
+            else:
+                request = self._queue.get()
+                if request is None:
+                    return
+                first = request
+
+            batch, closing = self._collect(first, closing)
+            started = monotonic()
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._wait_total += sum(started - queued for _, _, queued, _ in batch)
+
+            try:
+                results = self.handler(
+                    [item for item, _, _, _ in batch], **dict(first[3])
+                )
+                # Sin un resultado por pedido algún llamador esperaría para siempre
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"El lote de {len(batch)} pedidos devolvió "
+                        f"{len(results)} resultados"
+                    )
+                for (_, future, _, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as error:
+                for _, future, _, _ in batch:
+                    future.set_exception(error)
@@ -0,0 +1,145 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from time import perf_counter
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from plate_cli.constants import SERVE_BATCH_WINDOW, SERVE_MAX_BATCH, SERVE_MAX_BODY
+from plate_cli.models import Detection, Models
+from plate_cli.scheduler import BatchScheduler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer | _UnixHTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+            return
+        if self.path == "/metrics":
+            self._send_json(200, self.server.detection_server.batcher.metrics())
+            return
+        self._send_json(404, {"error": "Ruta no encontrada"})
+
+    def do_POST(self) -> None:
+        if self.path != "/detect":
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+
+        # El cuerpo no se lee si se rechaza la petición: se cierra la conexión
+        # para no interpretarlo como la petición siguiente
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {"error": "Content-Length no válido"})
+            return
+        if length <= 0:
+            self.close_connection = True
+            self._send_json(400, {"error": "La petición no contiene una imagen"})
+            return
+        max_body = self.server.detection_server.max_body
+        if length > max_body:
+            self.close_connection = True
+            self._send_json(
+                413, {"error": f"La imagen supera el máximo de {max_body} bytes"}
+            )
+            return
+
+        body = np.frombuffer(self.rfile.read(length), np.uint8)
+        image = cv2.imdecode(body, cv2.IMREAD_COLOR)
+        if image is None:
+            self._send_json(400, {"error": "Imagen no válida"})
+            return
+
+        start = perf_counter()
+        try:
+            detections = self.server.detection_server.detect(image)
+        except Exception as error:
+            self._send_json(500, {"error": str(error)})
+            return
+
+        self._send_json(
+            200,
+            {
+                "detections": [detection._asdict() for detection in detections],
+                "elapsed_ms": round((perf_counter() - start) * 1000, 2),
+            },
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Sin logs por petición: con sockets Unix no hay dirección de cliente
+        return
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    detection_server: "DetectionServer"
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+    detection_server: "DetectionServer"
+
+
+class DetectionServer:
+    """Mantiene los modelos cargados y atiende detecciones por HTTP."""
+
+    def __init__(
+        self,
+        models: Models,
+        max_batch_size: int = SERVE_MAX_BATCH,
+        batch_window: float = SERVE_BATCH_WINDOW,
+        max_body: int = SERVE_MAX_BODY,
+    ) -> None:
+        self.models = models
+        self.max_body = max_body
+        self.batcher: BatchScheduler[MatLike, List[Detection]] = BatchScheduler(
+            self._detect_batch, max_batch_size, batch_window
+        )
+        self.httpd: _HTTPServer | _UnixHTTPServer | None = None
+        self.socket_path: Path | None = None
+
+    def detect(self, image: MatLike) -> List[Detection]:
+        return self.batcher.submit(image).result()
+
+    def _detect_batch(self, images: List[MatLike]) -> List[List[Detection]]:
+        results = self.models.inference(images)
+        return self.models.read_plates_batch(images, results)
+
+    def bind(
+        self, host: str, port: int, socket_path: Path | None = None
+    ) -> _HTTPServer | _UnixHTTPServer:
+        self.socket_path = socket_path
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+            self.httpd = _UnixHTTPServer(str(socket_path), _Handler)
+        else:
+            self.httpd = _HTTPServer((host, port), _Handler)
+
+        self.httpd.detection_server = self
+        return self.httpd
+
+    def serve_forever(self) -> None:
+        if self.httpd is None:
+            raise RuntimeError("El servidor no ha sido inicializado.")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.batcher.close()
+            if self.socket_path is not None:
+                self.socket_path.unlink(missing_ok=True)
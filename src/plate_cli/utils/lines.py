@@ -0,0 +1,48 @@
+from typing import List
+
+import numpy as np
+from numpy.typing import NDArray
+
+from plate_cli.constants import LINE_MAX_INK, LINE_MIN_HEIGHT, LINE_MIN_INK
+
+# x_min, x_max, y_min, y_max: el formato de las cajas horizontales de EasyOCR
+Line = List[int]
+
+
+def split_lines(image: NDArray[np.uint8], padding: int = 2) -> List[Line]:
+    """Separa las líneas de texto de un recorte binarizado por proyección
+    horizontal. Reemplaza al detector CRAFT de EasyOCR cuando YOLO ya ubicó la
+    matrícula. Si no encuentra líneas devuelve el recorte completo."""
+    height, width = image.shape[:2]
+    whole = [[0, width, 0, height]]
+    if height == 0 or width == 0:
+        return whole
+
+    # El fondo es el valor que predomina en el borde del recorte
+    border = np.concatenate((image[0], image[-1], image[:, 0], image[:, -1]))
+    light_background = np.count_nonzero(border > 127) * 2 >= border.size
+    ink = image <= 127 if light_background else image > 127
+
+    rows = np.count_nonzero(ink, axis=1) / width
+    # Las filas casi llenas son el marco de la placa, no texto
+    text_rows = (rows >= LINE_MIN_INK) & (rows <= LINE_MAX_INK)
+
+    lines: List[Line] = []
+    start: int | None = None
+    for y, is_text in enumerate([*text_rows.tolist(), False]):
+        if is_text and start is None:
+            start = y
+        elif not is_text and start is not None:
+            if y - start >= LINE_MIN_HEIGHT * height:
+                columns = np.flatnonzero(ink[start:y].any(axis=0))
+                lines.append(
+                    [
+                        max(0, int(columns[0]) - padding),
+                        min(width, int(columns[-1]) + 1 + padding),
+                        max(0, start - padding),
+                        min(height, y + padding),
+                    ]
+                )
+            start = None
+
+    return lines or whole
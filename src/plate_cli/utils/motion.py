@@ -0,0 +1,66 @@
+from time import monotonic
+
+import cv2
+from cv2.typing import MatLike
+
+from plate_cli.constants import (
+    MOTION_MIN_AREA,
+    MOTION_PIXEL_THRESHOLD,
+    MOTION_REFRESH_INTERVAL,
+    MOTION_WIDTH,
+)
+
+
+class MotionGate:
+    """Decide si vale la pena correr YOLO sobre un frame comparándolo con el
+    anterior en una versión reducida y en escala de grises. Cada cierto tiempo
+    deja pasar un frame aunque la escena no haya cambiado."""
+
+    def __init__(
+        self,
+        min_area: float = MOTION_MIN_AREA,
+        pixel_threshold: int = MOTION_PIXEL_THRESHOLD,
+        refresh_interval: float = MOTION_REFRESH_INTERVAL,
+        width: int = MOTION_WIDTH,
+    ) -> None:
+        self.min_area = min_area
+        self.pixel_threshold = pixel_threshold
+        self.refresh_interval = refresh_interval
+        self.width = width
+
+        self._previous: MatLike | None = None
+        self._last_pass = 0.0
+        self.checked = 0
+        self.skipped = 0
+
+    def should_detect(self, frame: MatLike) -> bool:
+        self.checked += 1
+        small = self._reduce(frame)
+        previous, self._previous = self._previous, small
+
+        now = monotonic()
+        if previous is None or now - self._last_pass >= self.refresh_interval:
+            self._last_pass = now
+            return True
+
+        diff = cv2.absdiff(small, previous)
+        _, changed = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        area = cv2.countNonZero(changed) / changed.size
+
+        if area >= self.min_area:
+            self._last_pass = now
+            return True
+
+        self.skipped += 1
+        return False
+
+    def _reduce(self, frame: MatLike) -> MatLike:
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+
+        # Reducir antes de convertir a grises: se procesan menos píxeles
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # El desenfoque evita que el ruido del sensor cuente como movimiento
+        return cv2.GaussianBlur(small, (5, 5), 0)
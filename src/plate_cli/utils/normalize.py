@@ -1,3 +1,29 @@
+import re
+from typing import Dict
+
+# Formatos vigentes más comunes por país, sin espacios ni guiones. Sirven para
+# decidir si una lectura es plausible, no para corregirla
+PLATE_FORMATS: Dict[str, str] = {
+    "argentina": r"[A-Z]{2}\d{3}[A-Z]{2}|[A-Z]{3}\d{3}",
+    "bolivia": r"\d{3,4}[A-Z]{3}",
+    "brazil": r"[A-Z]{3}\d[A-Z0-9]\d{2}",
+    "chile": r"[A-Z]{4}\d{2}|[A-Z]{2}\d{4}",
+    "colombia": r"[A-Z]{3}\d{3}|[A-Z]{3}\d{2}[A-Z]",
+    "costa-rica": r"[A-Z]{3}\d{3}|\d{6}",
+    "ecuador": r"[A-Z]{3}\d{3,4}",
+    "guatemala": r"[A-Z]\d{3}[A-Z]{3}",
+    "mexico": r"[A-Z]{3}\d{3,4}|[A-Z]{3}\d{3}[A-Z]|\d{3}[A-Z]{3}",
+    "paraguay": r"[A-Z]{4}\d{3}|[A-Z]{3}\d{3}",
+    "peru": r"[A-Z][A-Z0-9][A-Z0-9]\d{3}",
+    "uruguay": r"[A-Z]{3}\d{4}",
+    "venezuela": r"[A-Z]{2}\d{3}[A-Z]{2}|[A-Z]{3}\d{2}[A-Z]",
+}
+DEFAULT_PLATE_FORMAT = r"[A-Z0-9]{5,8}"
+
+_PATTERNS = {country: re.compile(pattern) for country, pattern in PLATE_FORMATS.items()}
+_DEFAULT_PATTERN = re.compile(DEFAULT_PLATE_FORMAT)
+
+
 def normalize_argentina(text: str) -> str:
     if len(text) == 7:
         return f"{text[:2]} {text[2:5]} {text[5:]}"
@@ -27,3 +53,9 @@ def normalize_text(text: str, country: str) -> str:
         return text
 
     return RULES[country](text)
+
+
+def is_valid_plate(text: str, country: str) -> bool:
+    """Indica si el texto, normalizado o no, respeta el formato del país."""
+    pattern = _PATTERNS.get(country, _DEFAULT_PATTERN)
+    return pattern.fullmatch(text.replace(" ", "").upper()) is not None
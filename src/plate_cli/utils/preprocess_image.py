@@ -1,43 +1,164 @@
+import json
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import cast
+from typing import Any, Dict, Tuple, cast
 
 import cv2
 import numpy as np
 from cv2.typing import MatLike
 from numpy.typing import NDArray
 
+from plate_cli.constants import (
+    COLOR_ORDER,
+    COUNTRY_PROFILES,
+    DEFAULT_COUNTRY_PROFILE,
+    FAST_TARGET_HEIGHT,
+    PREPROCESS_PROFILE,
+)
 
-def crop_image(image: NDArray[np.uint8], country: str) -> NDArray[np.uint8]:
-    h, w = image.shape[:2]
+_GRAY_CONVERSIONS = {"bgr": cv2.COLOR_BGR2GRAY, "rgb": cv2.COLOR_RGB2GRAY}
+
+
+@lru_cache(maxsize=None)
+def morph_kernel(size: int) -> NDArray[np.uint8]:
+    return np.ones((size, size), np.uint8)
+
+
+class CountryProfile:
+    """Parámetros de preprocesamiento de un país con sus objetos ya construidos."""
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        # Proporciones (arriba, abajo, izquierda, derecha) del recorte a conservar
+        self.crop = cast(Tuple[float, float, float, float], tuple(options["crop"]))
+        self.upscale = float(options["upscale"])
+        self.clahe_clip = float(options["clahe_clip"])
+        self.clahe_grid = int(options["clahe_grid"])
+        self.kernel_size = int(options["kernel"])
+        self.threshold = str(options["threshold"])
+
+        if self.threshold not in ("otsu", "adaptive"):
+            raise ValueError(f"Modo de umbral desconocido: {self.threshold}")
+
+        self.kernel = morph_kernel(self.kernel_size)
+        # CLAHE guarda buffers internos, así que se crea uno por hilo
+        self._local = threading.local()
+
+    @property
+    def clahe(self) -> cv2.CLAHE:
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(
+                clipLimit=self.clahe_clip,
+                tileGridSize=(self.clahe_grid, self.clahe_grid),
+            )
+            self._local.clahe = clahe
+        return clahe
+
+
+_profiles: Dict[str, CountryProfile] = {}
+_default_profile = CountryProfile(DEFAULT_COUNTRY_PROFILE)
 
-    crops = {
-        "argentina": image[int(h * 0.2) : h, 0:w],
-        "bolivia": image[int(h * 0.2) : h, 0:w],
-        "brazil": image[int(h * 0.25) : h, int(w * 0.05) : int(w * 0.95)],
-        "chile": image[0 : int(h * 0.9), 0:w],
+
+def load_profiles(path: Path | None = None) -> None:
+    """Construye los perfiles por país, opcionalmente sobrescritos desde un JSON
+    con las claves `default` y `countries`."""
+    global _default_profile
+
+    default = dict(DEFAULT_COUNTRY_PROFILE)
+    countries = {
+        country: dict(options) for country, options in COUNTRY_PROFILES.items()
+    }
+
+    if path is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        default.update(config.get("default", {}))
+        for country, options in config.get("countries", {}).items():
+            countries.setdefault(country, {}).update(options)
+
+    # Se construyen todos antes de reemplazar: un JSON inválido no deja los
+    # perfiles a medio cargar
+    default_profile = CountryProfile(default)
+    profiles = {
+        country: CountryProfile({**default, **options})
+        for country, options in countries.items()
     }
 
-    if country not in crops:
-        return image[0:h, 0:w]
+    _default_profile = default_profile
+    _profiles.clear()
+    _profiles.update(profiles)
+
+
+def get_profile(country: str) -> CountryProfile:
+    if not _profiles:
+        load_profiles()
+    return _profiles.get(country, _default_profile)
+
+
+def crop_image(image: NDArray[np.uint8], profile: CountryProfile) -> NDArray[np.uint8]:
+    h, w = image.shape[:2]
+    top, bottom, left, right = profile.crop
+
+    return image[int(h * top) : int(h * bottom), int(w * left) : int(w * right)]
+
 
-    return crops[country]
+def upscale_factor(height: int, max_upscale: float) -> float:
+    """Escala necesaria para que el recorte llegue a la altura objetivo del OCR."""
+    if height <= 0:
+        return max_upscale
+    return min(max_upscale, max(1.0, FAST_TARGET_HEIGHT / height))
 
 
-def preprocess_image(image: NDArray[np.uint8], country: str) -> NDArray[np.uint8]:
-    image = crop_image(image, country)
+def to_gray(image: NDArray[np.uint8], color_order: str = COLOR_ORDER) -> MatLike:
+    """Convierte a escala de grises según el orden de canales de la imagen."""
+    if image.ndim == 2:
+        return image
+    if color_order not in _GRAY_CONVERSIONS:
+        raise ValueError(f"Orden de color desconocido: {color_order}")
+    return cv2.cvtColor(image, _GRAY_CONVERSIONS[color_order])
 
-    resized = cv2.resize(image, None, fx=4, fy=4, interpolation=cv2.INTER_CUBIC)
 
-    gray = cv2.cvtColor(resized, cv2.COLOR_RGB2GRAY)
-    denoised = cv2.fastNlMeansDenoising(gray, h=3)
+def binarize(image: MatLike, profile: CountryProfile) -> MatLike:
+    if profile.threshold == "adaptive":
+        return cv2.adaptiveThreshold(
+            image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+        )
 
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(denoised)
+    _, thresh = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def preprocess_image(
+    image: NDArray[np.uint8],
+    country: str,
+    profile: str = PREPROCESS_PROFILE,
+    color_order: str = COLOR_ORDER,
+) -> NDArray[np.uint8]:
+    if profile == "fast":
+        return preprocess_image_fast(image, country, color_order)
+    if profile == "light":
+        return preprocess_image_light(image, country, color_order)
+
+    country_profile = get_profile(country)
+    image = crop_image(image, country_profile)
+
+    # Pasar a grises antes de escalar: se redimensiona un canal en lugar de tres
+    gray = to_gray(image, color_order)
+
+    factor = country_profile.upscale
+    resized = cv2.resize(
+        gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC
+    )
+
+    denoised = cv2.fastNlMeansDenoising(resized, h=3)
+
+    enhanced = country_profile.clahe.apply(denoised)
 
     blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
-    _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    thresh = binarize(blurred, country_profile)
 
-    kernel = np.ones((6, 6), np.uint8)
+    kernel = country_profile.kernel
 
     # Eliminar puntos o líneas pequeñas
     cleaned = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
@@ -49,6 +170,51 @@ def preprocess_image(image: NDArray[np.uint8], country: str) -> NDArray[np.uint8
     return cast(NDArray[np.uint8], final_img)
 
 
+def preprocess_image_fast(
+    image: NDArray[np.uint8], country: str, color_order: str = COLOR_ORDER
+) -> NDArray[np.uint8]:
+    country_profile = get_profile(country)
+    image = crop_image(image, country_profile)
+
+    # Filtrar ruido sobre el recorte original, antes de agrandarlo
+    gray = to_gray(image, color_order)
+    denoised = cv2.medianBlur(gray, 3)
+
+    factor = upscale_factor(gray.shape[0], country_profile.upscale)
+    resized = cv2.resize(
+        denoised, None, fx=factor, fy=factor, interpolation=cv2.INTER_LINEAR
+    )
+
+    enhanced = country_profile.clahe.apply(resized)
+    thresh = binarize(enhanced, country_profile)
+
+    # El kernel acompaña a la escala respecto del aumento del perfil
+    size = max(2, round(country_profile.kernel_size * factor / country_profile.upscale))
+    kernel = morph_kernel(size)
+
+    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+    final_img = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, kernel)
+
+    return cast(NDArray[np.uint8], final_img)
+
+
+def preprocess_image_light(
+    image: NDArray[np.uint8], country: str, color_order: str = COLOR_ORDER
+) -> NDArray[np.uint8]:
+    """Solo grises y escala: suficiente para placas limpias y con buena luz."""
+    country_profile = get_profile(country)
+    gray = to_gray(crop_image(image, country_profile), color_order)
+
+    factor = upscale_factor(gray.shape[0], country_profile.upscale)
+    if factor == 1:
+        return cast(NDArray[np.uint8], gray)
+    resized = cv2.resize(
+        gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_LINEAR
+    )
+
+    return cast(NDArray[np.uint8], resized)
+
+
 def save_preprocess(final_img: MatLike, country: str):
     output_path = Path(f"preprocess/{country}.png")
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+    from ultralytics.engine.results import Results
+
+# Esquina superior izquierda del recorte dentro del frame completo
+Offset = Tuple[int, int]
+
+
+class RegionOfInterest:
+    """Rectángulo del frame donde se buscan matrículas. Los valores entre 0 y 1
+    son proporciones del frame; los mayores, píxeles."""
+
+    def __init__(self, x_min: float, y_min: float, x_max: float, y_max: float) -> None:
+        if x_min >= x_max or y_min >= y_max:
+            raise ValueError("La región de interés está vacía")
+        self.box = (x_min, y_min, x_max, y_max)
+        self.relative = max(self.box) <= 1
+
+    def __repr__(self) -> str:
+        return f"RegionOfInterest{self.box}"
+
+    # Iguales si cubren la misma región: el planificador agrupa por región
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RegionOfInterest) and self.box == other.box
+
+    def __hash__(self) -> int:
+        return hash(self.box)
+
+    @classmethod
+    def parse(cls, value: str) -> "RegionOfInterest":
+        """Lee `x_min,y_min,x_max,y_max`, por ejemplo `0,0.5,1,1`."""
+        parts = [float(part) for part in value.split(",")]
+        if len(parts) != 4:
+            raise ValueError(f"Región de interés no válida: {value}")
+        return cls(*parts)
+
+    def rect(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        x_min, y_min, x_max, y_max = self.box
+        if self.relative:
+            x_min, x_max = x_min * width, x_max * width
+            y_min, y_max = y_min * height, y_max * height
+        return (
+            max(0, int(x_min)),
+            max(0, int(y_min)),
+            min(width, int(x_max)),
+            min(height, int(y_max)),
+        )
+
+    def crop(self, image: MatLike) -> Tuple[MatLike, Offset]:
+        """Región del frame y su esquina superior izquierda, con la que
+        `to_full_frame` devuelve las cajas a coordenadas del frame."""
+        height, width = image.shape[:2]
+        x_min, y_min, x_max, y_max = self.rect(width, height)
+        return image[y_min:y_max, x_min:x_max], (x_min, y_min)
+
+
+def to_full_frame(result: Results, frame: MatLike, offset: Offset) -> Results:
+    """Traslada las cajas detectadas en un recorte a coordenadas del frame, para
+    que el OCR y draw_box trabajen sobre la imagen en resolución completa."""
+    from ultralytics.engine.results import Results
+
+    data = result.boxes.data.clone() if result.boxes is not None else None
+    if data is not None:
+        x_offset, y_offset = offset
+        data[:, [0, 2]] += x_offset
+        data[:, [1, 3]] += y_offset
+
+    return Results(frame, path=result.path, names=result.names, boxes=data)
@@ -0,0 +1,43 @@
+from typing import NamedTuple
+
+from plate_cli.utils.roi import RegionOfInterest
+
+_OPTIONS = ("roi", "imgsz")
+
+
+class CameraSource(NamedTuple):
+    """Fuente de video con su región de interés y resolución de inferencia. Sin
+    ellas se usan las globales de `--roi` e `--imgsz`."""
+
+    source: str
+    roi: RegionOfInterest | None = None
+    imgsz: int | None = None
+
+    @classmethod
+    def parse(cls, value: str) -> "CameraSource":
+        """Lee `fuente[;roi=X_MIN,Y_MIN,X_MAX,Y_MAX][;imgsz=N]`, por ejemplo
+        `rtsp://camara/stream;roi=0,0.5,1,1;imgsz=1280`. Solo se separan las
+        opciones conocidas del final: cualquier otro `;` queda en la fuente,
+        que puede ser una URL con parámetros propios."""
+        source = value
+        roi: RegionOfInterest | None = None
+        imgsz: int | None = None
+
+        while True:
+            head, separator, option = source.rpartition(";")
+            key, _, setting = option.partition("=")
+            if not separator or key not in _OPTIONS:
+                break
+            source = head
+            # Si una opción se repite vale la última, que se lee primero
+            if key == "roi" and roi is None:
+                roi = RegionOfInterest.parse(setting)
+            elif key == "imgsz" and imgsz is None:
+                imgsz = int(setting)
+
+        if not source:
+            raise ValueError(f"Fuente vacía: {value}")
+        return cls(source, roi, imgsz)
+
+    def __str__(self) -> str:
+        return self.source
@@ -0,0 +1,93 @@
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+from plate_cli.constants import NMS_THRESHOLD, TILE_MATCH_THRESHOLD
+from plate_cli.utils.roi import Offset
+
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+    from ultralytics.engine.results import Results
+
+
+def tile_starts(length: int, size: int, overlap: float) -> List[int]:
+    """Inicios de las ventanas sobre un eje. La última se alinea con el borde
+    para no procesar relleno."""
+    if length <= size:
+        return [0]
+
+    stride = max(1, int(size * (1 - overlap)))
+    starts = list(range(0, length - size, stride))
+    starts.append(length - size)
+    return starts
+
+
+def tile_image(
+    image: MatLike, size: int, overlap: float
+) -> List[Tuple[MatLike, Offset]]:
+    """Ventanas solapadas del frame con su desplazamiento. Cada ventana indexa
+    el frame, así que armar el lote no duplica una imagen de varios megapíxeles."""
+    height, width = image.shape[:2]
+    return [
+        (image[y : y + size, x : x + size], (x, y))
+        for y in tile_starts(height, size, overlap)
+        for x in tile_starts(width, size, overlap)
+    ]
+
+
+def merge_tiles(
+    results: List[Results], offsets: List[Offset], frame: MatLike
+) -> Results:
+    """Une las detecciones de las ventanas en coordenadas del frame y elimina
+    las repetidas en las zonas de solapamiento."""
+    import torch
+    from ultralytics.engine.results import Results
+
+    first = results[0]
+    shifted = []
+    for result, (x_offset, y_offset) in zip(results, offsets):
+        if result.boxes is None or not len(result.boxes):
+            continue
+        data = result.boxes.data.clone()
+        data[:, [0, 2]] += x_offset
+        data[:, [1, 3]] += y_offset
+        shifted.append(data)
+
+    if not shifted:
+        return Results(frame, path=first.path, names=first.names, boxes=None)
+
+    data = torch.cat(shifted)
+    keep = suppress(data.cpu().numpy())
+    return Results(frame, path=first.path, names=first.names, boxes=data[keep])
+
+
+def suppress(
+    data: np.ndarray,
+    iou_threshold: float = NMS_THRESHOLD,
+    match_threshold: float = TILE_MATCH_THRESHOLD,
+) -> List[int]:
+    """NMS por clase entre ventanas. Además del IoU usa la intersección sobre la
+    caja menor: una matrícula cortada por el borde de una ventana queda dentro
+    de la completa detectada en la vecina, pero con IoU bajo."""
+    x_min, y_min, x_max, y_max, scores, classes = data[:, :6].T
+    areas = (x_max - x_min) * (y_max - y_min)
+
+    keep: List[int] = []
+    for index in np.argsort(-scores):
+        if keep:
+            kept = np.array(keep)
+            width = np.minimum(x_max[index], x_max[kept]) - np.maximum(
+                x_min[index], x_min[kept]
+            )
+            height = np.minimum(y_max[index], y_max[kept]) - np.maximum(
+                y_min[index], y_min[kept]
+            )
+            inter = np.clip(width, 0, None) * np.clip(height, 0, None)
+            iou = inter / (areas[index] + areas[kept] - inter + 1e-9)
+            ios = inter / (np.minimum(areas[index], areas[kept]) + 1e-9)
+            same = classes[kept] == classes[index]
+            if np.any(same & ((iou > iou_threshold) | (ios > match_threshold))):
+                continue
+        keep.append(int(index))
+
+    return keep
@@ -0,0 +1,153 @@
+from collections import Counter, deque
+from typing import Deque, Dict, List, Tuple
+
+from plate_cli.constants import (
+    TRACK_HISTORY,
+    TRACK_IOU_THRESHOLD,
+    TRACK_MAX_DISTANCE,
+    TRACK_MAX_MISSED,
+    TRACK_MAX_READINGS,
+    TRACK_OCR_INTERVAL,
+)
+
+BBox = Tuple[int, int, int, int]
+
+
+def iou(a: BBox, b: BBox) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    if intersection == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return intersection / (area_a + area_b - intersection)
+
+
+def centroid_distance(a: BBox, b: BBox) -> float:
+    """Distancia entre centros relativa a la diagonal de `a`."""
+    dx = (a[0] + a[2] - b[0] - b[2]) / 2
+    dy = (a[1] + a[3] - b[1] - b[3]) / 2
+    diagonal = max(1.0, ((a[2] - a[0]) ** 2 + (a[3] - a[1]) ** 2) ** 0.5)
+    return (dx**2 + dy**2) ** 0.5 / diagonal
+
+
+class Track:
+    def __init__(
+        self, track_id: int, bbox: BBox, country: str, confidence: float, frame: int
+    ) -> None:
+        self.id = track_id
+        self.bbox = bbox
+        self.confidence = confidence
+        self.countries: Counter[str] = Counter({country: 1})
+        self.votes: Counter[str] = Counter()
+        self.last_seen = frame
+        self.last_ocr: int | None = None
+
+    @property
+    def country(self) -> str:
+        return self.countries.most_common(1)[0][0]
+
+    @property
+    def text(self) -> str:
+        """Lectura más votada entre todas las del vehículo."""
+        if not self.votes:
+            return ""
+        return self.votes.most_common(1)[0][0]
+
+    @property
+    def readings(self) -> int:
+        return sum(self.votes.values())
+
+    def add_reading(self, text: str) -> None:
+        if text:
+            self.votes[text] += 1
+
+
+class PlateTracker:
+    """Asocia las cajas de YOLO entre frames por IoU y, si no alcanza, por
+    cercanía de centros."""
+
+    def __init__(
+        self,
+        iou_threshold: float = TRACK_IOU_THRESHOLD,
+        max_distance: float = TRACK_MAX_DISTANCE,
+        max_missed: int = TRACK_MAX_MISSED,
+        ocr_interval: int = TRACK_OCR_INTERVAL,
+        max_readings: int = TRACK_MAX_READINGS,
+    ) -> None:
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.ocr_interval = ocr_interval
+        self.max_readings = max_readings
+
+        self.frame = 0
+        self.active: Dict[int, Track] = {}
+        self.finished: Deque[Track] = deque(maxlen=TRACK_HISTORY)
+        self._next_id = 1
+
+    def update(self, boxes: List[Tuple[BBox, str, float]]) -> List[Track]:
+        """Devuelve el track de cada caja, en el mismo orden de entrada."""
+        self.frame += 1
+
+        matches: Dict[int, Track] = {}
+        free_tracks = dict(self.active)
+
+        candidates = sorted(
+            (
+                (iou(track.bbox, bbox), index, track.id)
+                for index, (bbox, _, _) in enumerate(boxes)
+                for track in free_tracks.values()
+            ),
+            reverse=True,
+        )
+        for score, index, track_id in candidates:
+            if score < self.iou_threshold:
+                break
+            if index in matches or track_id not in free_tracks:
+                continue
+            matches[index] = free_tracks.pop(track_id)
+
+        # Segunda pasada por distancia para cajas que se movieron mucho
+        for index, (bbox, _, _) in enumerate(boxes):
+            if index in matches or not free_tracks:
+                continue
+            track = min(
+                free_tracks.values(),
+                key=lambda track: centroid_distance(track.bbox, bbox),
+            )
+            if centroid_distance(track.bbox, bbox) <= self.max_distance:
+                matches[index] = free_tracks.pop(track.id)
+
+        tracks: List[Track] = []
+        for index, (bbox, country, confidence) in enumerate(boxes):
+            track = matches.get(index)
+            if track is None:
+                track = Track(self._next_id, bbox, country, confidence, self.frame)
+                self.active[track.id] = track
+                self._next_id += 1
+            else:
+                track.bbox = bbox
+                track.confidence = max(track.confidence, confidence)
+                track.countries[country] += 1
+                track.last_seen = self.frame
+            tracks.append(track)
+
+        for track in free_tracks.values():
+            if self.frame - track.last_seen > self.max_missed:
+                self.finished.append(self.active.pop(track.id))
+
+        return tracks
+
+    def needs_ocr(self, track: Track) -> bool:
+        """El OCR corre en tracks nuevos y, cada tanto, para refinar la lectura."""
+        if track.last_ocr is None:
+            return True
+        if track.readings >= self.max_readings:
+            return False
+        return self.frame - track.last_ocr >= self.ocr_interval
+
+    def tracks(self) -> List[Track]:
+        """Tracks finalizados recientes y activos, del más antiguo al más nuevo."""
+        return [*self.finished, *self.active.values()]
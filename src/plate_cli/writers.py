@@ -0,0 +1,209 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, List
+
+from plate_cli.constants import OUTPUT_FORMATS, PARQUET_ROW_GROUP
+
+# Resultado de una imagen: path, detections, timings y, si falló, error
+Record = Dict[str, Any]
+Row = Dict[str, Any]
+
+ROW_FIELDS = (
+    "path",
+    "country",
+    "text",
+    "confidence",
+    "x_min",
+    "y_min",
+    "x_max",
+    "y_max",
+    "inference_ms",
+    "ocr_ms",
+    "error",
+)
+
+
+def record_rows(record: Record) -> List[Row]:
+    """Aplana el resultado de una imagen en una fila por detección. Las imágenes
+    sin detecciones o con error dejan una fila con los campos vacíos."""
+    timings = record.get("timings") or {}
+    base: Row = dict.fromkeys(ROW_FIELDS)
+    base.update(
+        path=record["path"],
+        inference_ms=timings.get("inference_ms"),
+        ocr_ms=timings.get("ocr_ms"),
+        error=record.get("error"),
+    )
+
+    detections = record.get("detections") or []
+    if not detections:
+        return [base]
+
+    rows: List[Row] = []
+    for detection in detections:
+        x_min, y_min, x_max, y_max = detection["bbox"]
+        rows.append(
+            {
+                **base,
+                "country": detection["country"],
+                "text": detection["text"],
+                "confidence": detection["confidence"],
+                "x_min": x_min,
+                "y_min": y_min,
+                "x_max": x_max,
+                "y_max": y_max,
+            }
+        )
+    return rows
+
+
+class ResultWriter(ABC):
+    """Escribe resultados a medida que llegan, sin acumularlos en memoria."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(exist_ok=True, parents=True)
+
+    def write(self, record: Record) -> None:
+        self.write_rows(record_rows(record))
+
+    @abstractmethod
+    def write_rows(self, rows: List[Row]) -> None: ...
+
+    @abstractmethod
+    def flush(self) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class JsonlWriter(ResultWriter):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._file: IO[str] = path.open("w", encoding="utf-8")
+
+    def write_rows(self, rows: List[Row]) -> None:
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvWriter(ResultWriter):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._file: IO[str] = path.open("w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=ROW_FIELDS)
+        self._writer.writeheader()
+
+    def write_rows(self, rows: List[Row]) -> None:
+        self._writer.writerows(rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter(ResultWriter):
+    """Parquet no admite agregar filas sueltas: se escribe un grupo de filas cada
+    `row_group` detecciones y el resto al cerrar."""
+
+    def __init__(self, path: Path, row_group: int = PARQUET_ROW_GROUP) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise RuntimeError(
+                "Para escribir Parquet instala pyarrow: pip install plate-cli[parquet]"
+            ) from error
+
+        super().__init__(path)
+        self.row_group = max(1, row_group)
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("path", pa.string()),
+                ("country", pa.string()),
+                ("text", pa.string()),
+                ("confidence", pa.float64()),
+                ("x_min", pa.int32()),
+                ("y_min", pa.int32()),
+                ("x_max", pa.int32()),
+                ("y_max", pa.int32()),
+                ("inference_ms", pa.float64()),
+                ("ocr_ms", pa.float64()),
+                ("error", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows: List[Row] = []
+
+    def write_rows(self, rows: List[Row]) -> None:
+        self._rows += rows
+        if len(self._rows) >= self.row_group:
+            self._write_group()
+
+    def flush(self) -> None:
+        # Solo se vacía al completar un grupo para no fragmentar el archivo
+        return
+
+    def close(self) -> None:
+        self._write_group()
+        self._writer.close()
+
+    def _write_group(self) -> None:
+        if not self._rows:
+            return
+        self._writer.write_table(
+            self._pa.Table.from_pylist(self._rows, schema=self._schema)
+        )
+        self._rows = []
+
+
+def resolve_format(path: Path, output_format: str | None = None) -> str:
+    """Formato de `output_format` o, si no se indica, de la extensión. Falla si
+    la extensión es de otro formato conocido que el pedido."""
+    extension = path.suffix.lstrip(".").lower()
+    if output_format is None:
+        output_format = extension
+    elif extension in OUTPUT_FORMATS and extension != output_format:
+        raise ValueError(
+            f"La extensión de {path.name} no coincide con el formato {output_format}"
+        )
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Formato de salida no soportado: {output_format or path.name}. "
+            f"Opciones: {', '.join(OUTPUT_FORMATS)}"
+        )
+    return output_format
+
+
+def open_writer(path: Path, output_format: str | None = None) -> ResultWriter:
+    """Abre el escritor según `output_format` o, si no se indica, la extensión."""
+    output_format = resolve_format(path, output_format)
+    if output_format == "jsonl":
+        return JsonlWriter(path)
+    if output_format == "csv":
+        return CsvWriter(path)
+    return ParquetWriter(path)
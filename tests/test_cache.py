@@ -0,0 +1,178 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+
+import pytest
+
+from plate_cli import batch
+from plate_cli import cache as cache_module
+from plate_cli.batch import BatchProcessor, Cached
+from plate_cli.cache import ResultCache
+from plate_cli.models import Detection
+from plate_cli.pool import ProcessBatchRunner
+
+DETECTIONS = [Detection("chile", "CZ 93 42", 0.91, (650, 445, 790, 515))]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Cada acceso tiene un momento distinto aunque el reloj no avance
+    ticks = count(1)
+    monkeypatch.setattr(cache_module, "time", lambda: float(next(ticks)))
+
+
+def entry_size(key: str) -> int:
+    payload = json.dumps([detection._asdict() for detection in DETECTIONS])
+    return len(key) + len(payload)
+
+
+def test_get_returns_what_was_put(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+
+    assert cache.get("a") is None
+    cache.put("a", DETECTIONS)
+
+    assert cache.get("a") == DETECTIONS
+    assert cache.stats() == (1, entry_size("a"))
+    cache.close()
+
+
+def test_put_evicts_least_recently_used(tmp_path, clock):
+    cache = ResultCache(tmp_path / "cache.sqlite3", max_bytes=2 * entry_size("a"))
+
+    cache.put("a", DETECTIONS)
+    cache.put("b", DETECTIONS)
+    # Leer "a" la vuelve la más reciente: la tercera desplaza a "b"
+    assert cache.get("a") is not None
+    cache.put("c", DETECTIONS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == DETECTIONS
+    assert cache.get("c") == DETECTIONS
+    assert cache.stats() == (2, 2 * entry_size("a"))
+    cache.close()
+
+
+def test_replacing_an_entry_does_not_count_twice(tmp_path, clock):
+    cache = ResultCache(tmp_path / "cache.sqlite3", max_bytes=2 * entry_size("a"))
+
+    cache.put("a", DETECTIONS)
+    cache.put("a", DETECTIONS)
+    cache.put("b", DETECTIONS)
+
+    assert cache.stats()[0] == 2
+    cache.close()
+
+
+def test_size_survives_reopening(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    cache = ResultCache(path, max_bytes=2 * entry_size("a"))
+    cache.put("a", DETECTIONS)
+    cache.put("b", DETECTIONS)
+    cache.close()
+
+    cache = ResultCache(path, max_bytes=2 * entry_size("a"))
+    cache.put("c", DETECTIONS)
+
+    assert cache.get("a") is None
+    assert cache.stats()[0] == 2
+    cache.close()
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    cache.put("a", DETECTIONS)
+    cache.put("b", DETECTIONS)
+
+    assert cache.clear() == 2
+    assert cache.stats() == (0, 0)
+    cache.close()
+
+
+@pytest.fixture
+def keyed_cache(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    # Sin pesos en el árbol: la parte del modelo de la clave queda fija
+    cache._model_key = "modelo"
+    yield cache
+    cache.close()
+
+
+def test_key_depends_on_the_image_content(tmp_path, keyed_cache):
+    first = tmp_path / "a.jpg"
+    second = tmp_path / "b.jpg"
+    first.write_bytes(b"imagen")
+    second.write_bytes(b"imagen")
+
+    assert keyed_cache.key(first) == keyed_cache.key(second)
+
+    second.write_bytes(b"otra imagen")
+    assert keyed_cache.key(first) != keyed_cache.key(second)
+
+
+def test_load_skips_decoding_on_a_cache_hit(tmp_path, keyed_cache, monkeypatch):
+    path = tmp_path / "auto.jpg"
+    path.write_bytes(b"no es un jpeg")
+    keyed_cache.put(keyed_cache.key(path), DETECTIONS)
+
+    def decode_image(path):
+        raise AssertionError("un acierto de caché no debe decodificar")
+
+    monkeypatch.setattr(batch, "decode_image", decode_image)
+    processor = BatchProcessor(None, cache=keyed_cache)  # type: ignore[arg-type]
+
+    loaded = processor.load(path)
+    (record,) = processor.process_batch([loaded])
+
+    assert loaded == (path, Cached(DETECTIONS))
+    assert record["detections"][0]["text"] == "CZ 93 42"
+
+
+def test_load_decodes_on_a_cache_miss(tmp_path, keyed_cache):
+    path = tmp_path / "rota.jpg"
+    path.write_bytes(b"no es un jpeg")
+    processor = BatchProcessor(None, cache=keyed_cache)  # type: ignore[arg-type]
+
+    _, image = processor.load(path)
+
+    assert isinstance(image, OSError)
+
+
+class FakeExecutor:
+    def __init__(self) -> None:
+        self.entries = []
+
+    def submit(self, function, name, entries):
+        self.entries = entries
+        future = Future()
+        future.set_result(([{"path": entries[0][0], "error": entries[0][3]}], []))
+        return future
+
+
+def test_shared_memory_batches_skip_cached_images(tmp_path, keyed_cache):
+    hit = tmp_path / "auto.jpg"
+    miss = tmp_path / "rota.jpg"
+    hit.write_bytes(b"imagen guardada")
+    miss.write_bytes(b"no es un jpeg")
+    keyed_cache.put(keyed_cache.key(hit), DETECTIONS)
+
+    runner = ProcessBatchRunner(1, shared_memory=True, batch_size=2)
+    loader = BatchProcessor(None, cache=keyed_cache)  # type: ignore[arg-type]
+    executor = FakeExecutor()
+    written = []
+
+    class Writer:
+        write = written.append
+
+        def flush(self) -> None:
+            pass
+
+    with ThreadPoolExecutor(1) as decoder:
+        pending = runner._submit(executor, decoder, loader, [hit, miss])  # type: ignore[arg-type]
+        processed = runner._write(*pending, Writer())  # type: ignore[arg-type]
+
+    # Solo la imagen sin acierto viaja al proceso; el orden se conserva
+    assert [entry[0] for entry in executor.entries] == [str(miss)]
+    assert processed == 2
+    assert [record["path"] for record in written] == [str(hit), str(miss)]
+    assert written[0]["detections"][0]["text"] == "CZ 93 42"
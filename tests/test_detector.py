@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from plate_cli import detector
+from plate_cli.detector import artifact_path, export_weights
+
+
+def test_openvino_int8_requires_calibration_data(tmp_path):
+    weights = tmp_path / "weights.pt"
+    weights.write_bytes(b"pesos")
+
+    with pytest.raises(ValueError, match="--calibration-data"):
+        export_weights("openvino", int8=True, weights=weights)
+
+
+def test_torch_has_no_int8(tmp_path):
+    with pytest.raises(ValueError, match="INT8"):
+        export_weights("torch", int8=True, weights=tmp_path / "weights.pt")
+
+
+def test_artifacts_depend_on_the_calibration_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(detector, "EXPORT_DIR", tmp_path)
+    weights = Path("weights.pt")
+    first = tmp_path / "placas.yaml"
+    second = tmp_path / "otras.yaml"
+    first.write_text("path: placas")
+    second.write_text("path: otras")
+
+    assert artifact_path("torch", weights=weights) == weights
+    assert artifact_path("onnx", weights=weights).suffix == ".onnx"
+    assert artifact_path("openvino", True, weights, first) != artifact_path(
+        "openvino", True, weights, second
+    )
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import numpy as np
+
+from plate_cli.image_writer import ImageWriter
+from plate_cli.models import Detection
+
+DETECTIONS = [
+    Detection("chile", "CZ 93 42", 0.91, (10, 10, 60, 30)),
+    Detection("peru", "ABC 123", 0.8, (20, 40, 70, 60)),
+]
+
+
+def image() -> np.ndarray:
+    return np.zeros((80, 100, 3), np.uint8)
+
+
+def test_same_name_with_different_extension_does_not_collide(tmp_path):
+    with ImageWriter() as writer:
+        first = writer.submit(image(), Path("auto.jpg"), DETECTIONS, tmp_path)
+        second = writer.submit(image(), Path("auto.png"), DETECTIONS, tmp_path)
+
+    assert first != second
+    assert {path.name for path in first + second} == {
+        "auto_jpg_chile_CZ_93_42.jpg",
+        "auto_png_chile_CZ_93_42.jpg",
+    }
+    assert all(path.exists() for path in first + second)
+    assert writer.errors == []
+
+
+def test_crops_only_writes_one_file_per_detection(tmp_path):
+    with ImageWriter("png", crops_only=True) as writer:
+        paths = writer.submit(image(), Path("auto.jpg"), DETECTIONS, tmp_path)
+
+    assert [path.name for path in paths] == [
+        "auto_jpg_0_chile_CZ_93_42.png",
+        "auto_jpg_1_peru_ABC_123.png",
+    ]
+    assert all(path.exists() for path in paths)
+
+
+def test_encoding_errors_are_recorded_and_the_writer_keeps_going(tmp_path):
+    # Un formato que OpenCV no conoce hace fallar cv2.imencode
+    with ImageWriter("desconocido", workers=1) as writer:
+        writer.submit(image(), Path("a.jpg"), DETECTIONS, tmp_path)
+        writer.submit(image(), Path("b.jpg"), DETECTIONS, tmp_path)
+
+    assert [path.name for path, _ in writer.errors] == [
+        "a_jpg_chile_CZ_93_42.desconocido",
+        "b_jpg_chile_CZ_93_42.desconocido",
+    ]
@@ -0,0 +1,43 @@
+import numpy as np
+
+from plate_cli.utils.lines import split_lines
+
+
+def plate(background: int = 255) -> np.ndarray:
+    """Recorte de 100x200 con dos líneas de "texto" a rayas verticales."""
+    ink = 255 - background
+    image = np.full((100, 200), background, np.uint8)
+    image[10:40, 20:180:2] = ink
+    image[60:90, 30:171:2] = ink
+    return image
+
+
+def test_two_lines_are_split_with_padding():
+    assert split_lines(plate()) == [[18, 181, 8, 42], [28, 173, 58, 92]]
+
+
+def test_dark_background_is_detected():
+    assert split_lines(plate(background=0)) == split_lines(plate())
+
+
+def test_frame_rows_are_not_text():
+    image = plate()
+    # Marco de la placa: filas completamente entintadas arriba y abajo
+    image[3:6] = 0
+    image[94:97] = 0
+
+    assert split_lines(image, padding=0) == [[20, 179, 10, 40], [30, 171, 60, 90]]
+
+
+def test_short_bands_are_ignored():
+    image = np.full((100, 200), 255, np.uint8)
+    image[10:40, 20:180:2] = 0
+    # Una raya de 5 filas es ruido, no una línea
+    image[70:75, 20:180:2] = 0
+
+    assert split_lines(image, padding=0) == [[20, 179, 10, 40]]
+
+
+def test_without_text_the_whole_crop_is_returned():
+    assert split_lines(np.full((100, 200), 255, np.uint8)) == [[0, 200, 0, 100]]
+    assert split_lines(np.zeros((0, 200), np.uint8)) == [[0, 200, 0, 0]]
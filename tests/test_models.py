@@ -0,0 +1,32 @@
+from concurrent.futures import Future
+
+from plate_cli.models import Models
+
+
+def finished(error: Exception | None = None) -> Future[None]:
+    future: Future[None] = Future()
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+    return future
+
+
+def test_loaded_requires_every_load_to_succeed():
+    models = Models()
+    models._loading = {"yolo": finished(), "reader": Future()}
+    assert not models.ready
+    assert not models.loaded
+
+    models._loading["reader"] = finished(OSError("sin pesos"))
+    assert models.ready
+    assert not models.loaded
+
+    models._loading["reader"] = finished()
+    assert models.loaded
+
+
+def test_options_rebuild_an_equivalent_instance():
+    models = Models(ocr_mode="recognize", imgsz=1280, tile_size=640)
+
+    assert Models(**models.options()).options() == models.options()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from plate_cli.utils import motion
+from plate_cli.utils.motion import MotionGate
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(motion, "monotonic", lambda: now[0])
+    return now
+
+
+def frame(value: int = 0) -> np.ndarray:
+    return np.full((240, 320, 3), value, np.uint8)
+
+
+def with_square(side: int) -> np.ndarray:
+    image = frame()
+    image[:side, :side] = 255
+    return image
+
+
+def test_first_frame_always_passes(clock):
+    gate = MotionGate()
+
+    assert gate.should_detect(frame())
+    assert (gate.checked, gate.skipped) == (1, 0)
+
+
+def test_static_scene_is_skipped(clock):
+    gate = MotionGate()
+    gate.should_detect(frame())
+
+    assert not gate.should_detect(frame())
+    assert not gate.should_detect(frame())
+    assert (gate.checked, gate.skipped) == (3, 2)
+
+
+def test_change_above_min_area_passes(clock):
+    gate = MotionGate(min_area=0.05)
+    gate.should_detect(frame())
+
+    # Un cuadrado de 120x120 cubre casi el 19% del frame
+    assert gate.should_detect(with_square(120))
+
+
+def test_change_below_min_area_is_skipped(clock):
+    gate = MotionGate(min_area=0.05)
+    gate.should_detect(frame())
+
+    # Uno de 40x40 cubre cerca del 2%
+    assert not gate.should_detect(with_square(40))
+
+
+def test_small_brightness_changes_are_not_motion(clock):
+    gate = MotionGate(pixel_threshold=25)
+    gate.should_detect(frame(100))
+
+    assert not gate.should_detect(frame(110))
+    assert gate.should_detect(frame(140))
+
+
+def test_refresh_interval_lets_a_static_frame_through(clock):
+    gate = MotionGate(refresh_interval=2.0)
+    gate.should_detect(frame())
+
+    clock[0] += 1.0
+    assert not gate.should_detect(frame())
+    clock[0] += 1.0
+    assert gate.should_detect(frame())
+    assert not gate.should_detect(frame())
@@ -0,0 +1,58 @@
+import pytest
+
+from plate_cli.utils.normalize import is_valid_plate, normalize_text
+
+
+@pytest.mark.parametrize(
+    ("text", "country"),
+    [
+        ("AA464PA", "argentina"),
+        ("AA 464 PA", "argentina"),
+        ("FTK 281", "argentina"),
+        ("5662AHX", "bolivia"),
+        ("359BPH", "bolivia"),
+        ("GXF5B79", "brazil"),
+        ("LOM4A00", "brazil"),
+        ("ABC1234", "brazil"),
+        ("CZ 93 42", "chile"),
+        ("BBCL 12", "chile"),
+        ("abc123", "colombia"),
+        ("ABC12D", "colombia"),
+        ("SAB1234", "uruguay"),
+        ("XYZ 987", "narnia"),
+    ],
+)
+def test_is_valid_plate_accepts_country_formats(text, country):
+    assert is_valid_plate(text, country)
+
+
+@pytest.mark.parametrize(
+    ("text", "country"),
+    [
+        ("AA464P", "argentina"),
+        ("5662AH", "bolivia"),
+        ("GXF5B7", "brazil"),
+        ("GX5FB79", "brazil"),
+        ("C29342", "chile"),
+        ("CZ93421", "chile"),
+        ("", "peru"),
+        ("A-12", "narnia"),
+        ("ABCDEFGHI", "narnia"),
+    ],
+)
+def test_is_valid_plate_rejects_other_formats(text, country):
+    assert not is_valid_plate(text, country)
+
+
+@pytest.mark.parametrize(
+    ("text", "country", "expected"),
+    [
+        ("aa464pa", "argentina", "AA 464 PA"),
+        ("FTK281", "argentina", "FTK 281"),
+        ("BBCL12", "chile", "BBCL 12"),
+        ("CZ 9342", "chile", "CZ 93 42"),
+        ("5662 ahx", "bolivia", "5662AHX"),
+    ],
+)
+def test_normalize_text(text, country, expected):
+    assert normalize_text(text, country) == expected
@@ -0,0 +1,66 @@
+import threading
+
+from plate_cli.pipeline import DropOldestQueue, LatestValue, StreamStats
+
+
+def test_latest_value_returns_only_the_newest():
+    latest: LatestValue[str] = LatestValue()
+    latest.put("frame 1")
+    latest.put("frame 2")
+
+    sequence, value = latest.get(0, timeout=0.1)
+
+    assert (sequence, value) == (2, "frame 2")
+
+
+def test_latest_value_times_out_without_a_newer_value():
+    latest: LatestValue[str] = LatestValue()
+    latest.put("frame 1")
+
+    assert latest.get(1, timeout=0.01) == (1, None)
+
+
+def test_latest_value_wakes_up_a_waiting_reader():
+    latest: LatestValue[str] = LatestValue()
+    results = []
+    reader = threading.Thread(target=lambda: results.append(latest.get(0, 5)))
+    reader.start()
+
+    latest.put("frame 1")
+    reader.join(5)
+
+    assert results == [(1, "frame 1")]
+
+
+def test_drop_oldest_queue_discards_the_oldest_when_full():
+    items: DropOldestQueue[int] = DropOldestQueue(2)
+    for item in range(4):
+        items.put(item)
+
+    assert items.dropped == 2
+    assert items.get(0.01) == 2
+    assert items.get(0.01) == 3
+    assert items.get(0.01) is None
+
+
+def test_drop_oldest_queue_keeps_at_least_one_item():
+    items: DropOldestQueue[int] = DropOldestQueue(0)
+    items.put(1)
+    items.put(2)
+
+    assert items.dropped == 1
+    assert items.get(0.01) == 2
+
+
+def test_stream_stats_smooths_fps_and_latency():
+    stats = StreamStats(smoothing=0.5)
+
+    stats.captured(10.0)
+    stats.captured(10.1)
+    stats.captured(10.3)
+    stats.detected(captured_at=10.0, now=10.2)
+
+    capture_fps, detection_fps, latency_ms = stats.snapshot()
+    assert round(capture_fps, 6) == 7.5
+    assert detection_fps == 0
+    assert round(latency_ms, 6) == 200
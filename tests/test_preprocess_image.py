@@ -0,0 +1,135 @@
+import json
+
+import numpy as np
+import pytest
+
+from plate_cli.constants import FAST_TARGET_HEIGHT
+from plate_cli.utils.preprocess_image import (
+    get_profile,
+    load_profiles,
+    preprocess_image,
+    to_gray,
+    upscale_factor,
+)
+
+
+@pytest.fixture
+def plate():
+    # Recorte BGR de 40x120 con texto oscuro sobre fondo claro
+    image = np.full((40, 120, 3), 220, np.uint8)
+    image[10:30, 10:20] = 30
+    image[10:30, 40:50] = 30
+    image[10:30, 70:80] = 30
+    return image
+
+
+@pytest.mark.parametrize("profile", ["quality", "fast"])
+def test_profiles_return_binary_gray_images(plate, profile):
+    result = preprocess_image(plate, "peru", profile)
+
+    assert result.ndim == 2
+    assert result.dtype == np.uint8
+    assert set(np.unique(result)) <= {0, 255}
+
+
+def test_quality_profile_scales_by_the_country_upscale(plate):
+    result = preprocess_image(plate, "peru", "quality")
+    upscale = get_profile("peru").upscale
+
+    assert result.shape == (40 * upscale, 120 * upscale)
+
+
+def test_fast_profile_scales_to_the_target_height(plate):
+    result = preprocess_image(plate, "peru", "fast")
+
+    assert result.shape[0] == FAST_TARGET_HEIGHT
+
+
+def test_country_crop_is_applied_before_scaling(plate):
+    # Argentina descarta el 20 % superior del recorte
+    result = preprocess_image(plate, "argentina", "quality")
+    upscale = get_profile("argentina").upscale
+
+    assert result.shape == (32 * upscale, 120 * upscale)
+
+
+def test_upscale_factor_is_limited_by_the_profile():
+    assert upscale_factor(FAST_TARGET_HEIGHT // 4, 8.0) == 4.0
+    assert upscale_factor(10, 4.0) == 4.0
+    assert upscale_factor(FAST_TARGET_HEIGHT * 2, 4.0) == 1.0
+    assert upscale_factor(0, 3.0) == 3.0
+
+
+def test_to_gray_respects_the_color_order():
+    image = np.zeros((2, 2, 3), np.uint8)
+    image[..., 0] = 255
+
+    assert to_gray(image, "bgr")[0, 0] == 29
+    assert to_gray(image, "rgb")[0, 0] == 76
+    with pytest.raises(ValueError, match="Orden de color"):
+        to_gray(image, "hsv")
+
+
+@pytest.fixture
+def profiles_file(tmp_path):
+    # Deja los perfiles por defecto para las demás pruebas
+    yield tmp_path / "perfiles.json"
+    load_profiles()
+
+
+def test_load_profiles_overrides_default_and_countries(profiles_file):
+    profiles_file.write_text(
+        json.dumps(
+            {
+                "default": {"upscale": 2.0},
+                "countries": {
+                    "chile": {"threshold": "adaptive"},
+                    "peru": {"kernel": 3},
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    load_profiles(profiles_file)
+
+    chile = get_profile("chile")
+    assert chile.threshold == "adaptive"
+    # Lo que el JSON no cambia se conserva de las constantes
+    assert chile.crop == (0.0, 0.9, 0.0, 1.0)
+    assert chile.upscale == 2.0
+    assert get_profile("peru").kernel.shape == (3, 3)
+    assert get_profile("narnia").upscale == 2.0
+
+
+def test_load_profiles_rejects_unknown_threshold(profiles_file):
+    profiles_file.write_text(
+        json.dumps({"countries": {"chile": {"threshold": "sauvola"}}}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="sauvola"):
+        load_profiles(profiles_file)
+    # Los perfiles anteriores siguen vigentes
+    assert get_profile("chile").threshold == "otsu"
+
+
+def test_load_profiles_rejects_invalid_json(profiles_file):
+    profiles_file.write_text("{default: 1}", encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        load_profiles(profiles_file)
+
+
+def test_load_profiles_rejects_invalid_values(profiles_file):
+    profiles_file.write_text(
+        json.dumps({"default": {"upscale": "mucho"}}), encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError):
+        load_profiles(profiles_file)
+
+
+def test_load_profiles_requires_an_existing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_profiles(tmp_path / "no-existe.json")
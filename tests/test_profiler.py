@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from plate_cli.profiler import Profiler, percentile
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [(0, 1.0), (10, 1.0), (50, 5.0), (95, 10.0), (99, 10.0), (100, 10.0)],
+)
+def test_percentile_uses_nearest_rank(q, expected):
+    values = [float(value) for value in range(1, 11)]
+
+    assert percentile(values, q) == expected
+
+
+def test_percentile_of_nothing_is_zero():
+    assert percentile([], 50) == 0.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+
+    with profiler.stage("ocr"):
+        pass
+
+    assert profiler.summary() == []
+
+
+def test_summary_per_stage():
+    profiler = Profiler()
+    profiler.enable()
+    for duration in (0.010, 0.020, 0.030, 0.040):
+        profiler.record("ocr", 1.0, 1.0 + duration)
+    profiler.record("inference", 1.0, 1.5)
+
+    (inference, ocr) = profiler.summary()
+
+    assert inference[:2] == ("inference", 1)
+    name, count, total, p50, p95, p99 = ocr
+    assert (name, count) == ("ocr", 4)
+    assert total == pytest.approx(0.1)
+    assert p50 == pytest.approx(20)
+    assert p95 == pytest.approx(40)
+    assert p99 == pytest.approx(40)
+
+
+def test_drain_and_merge_move_events_between_profilers():
+    coordinator = Profiler()
+    coordinator.enable()
+    worker = Profiler()
+    worker.enable(coordinator.origin)
+
+    worker.record("ocr", coordinator.origin + 1.0, coordinator.origin + 1.25)
+    events = worker.drain()
+    coordinator.merge(events)
+
+    assert worker.summary() == [] and worker.drain() == []
+    assert events[0]["ts"] == pytest.approx(1e6)
+    assert events[0]["dur"] == pytest.approx(0.25e6)
+    name, count, total, *_ = coordinator.summary()[0]
+    assert (name, count) == ("ocr", 1)
+    assert total == pytest.approx(0.25)
+
+
+def test_dump_writes_chrome_trace(tmp_path):
+    profiler = Profiler()
+    profiler.enable()
+    with profiler.stage("inference"):
+        pass
+
+    path = tmp_path / "trazas" / "traza.json"
+    profiler.dump(path)
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    assert [event["name"] for event in trace["traceEvents"]] == ["inference"]
+    assert trace["traceEvents"][0]["ph"] == "X"
+    assert trace["otherData"]["stages"]["inference"]["count"] == 1
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from plate_cli.utils.roi import RegionOfInterest, to_full_frame
+
+
+def test_parse_reads_proportions_and_pixels():
+    relative = RegionOfInterest.parse("0,0.5,1,1")
+    absolute = RegionOfInterest.parse("100,200,900,600")
+
+    assert relative.box == (0, 0.5, 1, 1)
+    assert relative.relative
+    assert not absolute.relative
+
+
+@pytest.mark.parametrize("value", ["0,0,1", "0,0,1,1,1", "a,0,1,1"])
+def test_parse_rejects_malformed_values(value):
+    with pytest.raises(ValueError):
+        RegionOfInterest.parse(value)
+
+
+def test_empty_region_is_rejected():
+    with pytest.raises(ValueError):
+        RegionOfInterest(0.5, 0, 0.5, 1)
+
+
+def test_rect_scales_proportions_and_clips_pixels():
+    assert RegionOfInterest(0, 0.5, 1, 1).rect(640, 480) == (0, 240, 640, 480)
+    assert RegionOfInterest(100, 50, 2000, 2000).rect(640, 480) == (100, 50, 640, 480)
+
+
+def test_crop_is_a_view_with_its_offset():
+    image = np.arange(48 * 64 * 3, dtype=np.uint8).reshape(48, 64, 3)
+
+    region, offset = RegionOfInterest(0.25, 0.5, 1, 1).crop(image)
+
+    assert offset == (16, 24)
+    assert region.shape == (24, 48, 3)
+    assert np.shares_memory(region, image)
+    assert (region == image[24:, 16:]).all()
+
+
+def test_equal_regions_hash_alike():
+    assert RegionOfInterest.parse("0,0.5,1,1") == RegionOfInterest(0, 0.5, 1, 1)
+    assert len({RegionOfInterest(0, 0, 1, 1), RegionOfInterest(0, 0, 1, 1)}) == 1
+    assert RegionOfInterest(0, 0, 1, 1) != RegionOfInterest(0, 0, 0.5, 1)
+
+
+def test_to_full_frame_moves_boxes_to_frame_coordinates():
+    torch = pytest.importorskip("torch")
+    results = pytest.importorskip("ultralytics.engine.results")
+
+    frame = np.zeros((480, 640, 3), np.uint8)
+    region, offset = RegionOfInterest(0, 0.5, 1, 1).crop(frame)
+    boxes = torch.tensor([[10.0, 20.0, 110.0, 60.0, 0.9, 0.0]])
+    result = results.Results(region, path="frame", names={0: "plate"}, boxes=boxes)
+
+    moved = to_full_frame(result, frame, offset)
+
+    assert moved.orig_img is frame
+    assert moved.boxes.xyxy.tolist() == [[10.0, 260.0, 110.0, 300.0]]
+    # La caja del recorte no se modifica
+    assert result.boxes.xyxy.tolist() == [[10.0, 20.0, 110.0, 60.0]]
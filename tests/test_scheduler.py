@@ -0,0 +1,102 @@
+import threading
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from plate_cli.scheduler import BatchScheduler
+
+
+class Recorder:
+    """Handler que guarda cada lote y sus opciones."""
+
+    def __init__(self, release: threading.Event | None = None) -> None:
+        self.calls: List[Tuple[List[int], Dict[str, Any]]] = []
+        self.release = release
+
+    def __call__(self, items: List[int], **options: Any) -> List[int]:
+        if self.release is not None:
+            self.release.wait(5)
+        self.calls.append((items, options))
+        return [item * 10 for item in items]
+
+
+def test_concurrent_requests_share_a_batch():
+    handler = Recorder()
+    scheduler = BatchScheduler(handler, max_batch_size=4, max_wait=1.0)
+
+    futures = [scheduler.submit(item) for item in range(4)]
+    results = [future.result(5) for future in futures]
+    scheduler.close()
+
+    assert results == [0, 10, 20, 30]
+    assert handler.calls == [([0, 1, 2, 3], {})]
+    assert scheduler.metrics()["mean_batch_size"] == 4
+
+
+def test_batch_is_sent_when_the_wait_expires():
+    handler = Recorder()
+    scheduler = BatchScheduler(handler, max_batch_size=8, max_wait=0.01)
+
+    assert scheduler.submit(1).result(5) == 10
+    assert scheduler.submit(2).result(5) == 20
+    scheduler.close()
+
+    assert [items for items, _ in handler.calls] == [[1], [2]]
+
+
+def test_requests_with_other_options_go_in_separate_batches():
+    handler = Recorder()
+    scheduler = BatchScheduler(handler, max_batch_size=4, max_wait=0.5)
+
+    futures = [
+        scheduler.submit(0, roi="a"),
+        scheduler.submit(1, roi="a"),
+        scheduler.submit(2, roi="b"),
+        scheduler.submit(3, roi="a"),
+    ]
+
+    assert [future.result(5) for future in futures] == [0, 10, 20, 30]
+    scheduler.close()
+
+    # El pedido con otra región espera al lote siguiente
+    assert handler.calls == [([0, 1, 3], {"roi": "a"}), ([2], {"roi": "b"})]
+
+
+def test_close_processes_pending_requests():
+    release = threading.Event()
+    handler = Recorder(release)
+    scheduler = BatchScheduler(handler, max_batch_size=2, max_wait=0.0)
+
+    futures = [scheduler.submit(item, roi=item % 2) for item in range(5)]
+    closing = threading.Thread(target=scheduler.close)
+    closing.start()
+    release.set()
+    closing.join(5)
+
+    assert not closing.is_alive()
+    assert [future.result(0) for future in futures] == [0, 10, 20, 30, 40]
+    assert scheduler.queue_depth == 0
+
+
+def test_handler_error_fails_the_whole_batch():
+    def handler(items: List[int]) -> List[int]:
+        raise RuntimeError("sin modelo")
+
+    scheduler = BatchScheduler(handler, max_batch_size=2, max_wait=1.0)
+    futures = [scheduler.submit(1), scheduler.submit(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="sin modelo"):
+            future.result(5)
+    scheduler.close()
+
+
+@pytest.mark.parametrize("returned", [[], [10], [10, 20, 30]])
+def test_wrong_number_of_results_fails_every_request(returned):
+    scheduler = BatchScheduler(lambda items: returned, max_batch_size=2, max_wait=1.0)
+    futures = [scheduler.submit(1), scheduler.submit(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="2 pedidos"):
+            future.result(5)
+    scheduler.close()
@@ -0,0 +1,59 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from plate_cli.server import DetectionServer
+
+
+@pytest.fixture
+def server():
+    # Las peticiones rechazadas no llegan a los modelos
+    detection_server = DetectionServer(None, max_body=1024)  # type: ignore[arg-type]
+    httpd = detection_server.bind("127.0.0.1", 0)
+    thread = threading.Thread(target=detection_server.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    thread.join(5)
+
+
+def post(address, headers: str, body: bytes = b"") -> tuple[int, dict]:
+    with socket.create_connection(address, timeout=5) as connection:
+        connection.sendall(
+            f"POST /detect HTTP/1.1\r\nHost: test\r\n{headers}\r\n".encode() + body
+        )
+        response = b""
+        while chunk := connection.recv(4096):
+            response += chunk
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_rejects_non_numeric_content_length(server):
+    status, body = post(server, "Content-Length: mucho\r\n")
+
+    assert status == 400
+    assert "Content-Length" in body["error"]
+
+
+def test_rejects_missing_body(server):
+    status, _ = post(server, "")
+
+    assert status == 400
+
+
+def test_rejects_body_over_the_maximum(server):
+    status, body = post(server, "Content-Length: 4096\r\n", b"x" * 4096)
+
+    assert status == 413
+    assert "1024" in body["error"]
+
+
+def test_rejects_invalid_image(server):
+    status, body = post(server, "Content-Length: 4\r\n", b"nada")
+
+    assert status == 400
+    assert body["error"] == "Imagen no válida"
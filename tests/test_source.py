@@ -0,0 +1,42 @@
+import pytest
+
+from plate_cli.utils.roi import RegionOfInterest
+from plate_cli.utils.source import CameraSource
+
+
+def test_source_without_options():
+    assert CameraSource.parse("0") == CameraSource("0")
+
+
+def test_options_are_read_from_the_end():
+    source = CameraSource.parse("rtsp://camara/stream;roi=0,0.5,1,1;imgsz=1280")
+
+    assert source == CameraSource(
+        "rtsp://camara/stream", RegionOfInterest(0, 0.5, 1, 1), 1280
+    )
+
+
+def test_semicolons_inside_the_url_are_kept():
+    url = "http://camara/video.cgi;jsessionid=abc;resolution=1080"
+
+    assert CameraSource.parse(url).source == url
+    assert CameraSource.parse(f"{url};imgsz=960") == CameraSource(url, imgsz=960)
+
+
+def test_credentials_in_the_url_are_kept():
+    url = "rtsp://usuario:cl@ve;1@camara:554/stream"
+
+    source = CameraSource.parse(f"{url};roi=0,0,0.5,1")
+
+    assert source.source == url
+    assert source.roi == RegionOfInterest(0, 0, 0.5, 1)
+
+
+def test_last_repeated_option_wins():
+    assert CameraSource.parse("0;imgsz=640;imgsz=1280").imgsz == 1280
+
+
+@pytest.mark.parametrize("value", ["", ";imgsz=640", "0;imgsz=grande", "0;roi=0,0,1"])
+def test_invalid_sources_are_rejected(value):
+    with pytest.raises(ValueError):
+        CameraSource.parse(value)
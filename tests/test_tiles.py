@@ -0,0 +1,67 @@
+import numpy as np
+
+from plate_cli.utils.tiles import suppress, tile_image, tile_starts
+
+
+def detections(*rows):
+    # x_min, y_min, x_max, y_max, confianza, clase
+    return np.array(rows, dtype=np.float32)
+
+
+def test_tile_starts_covers_the_axis_and_ends_at_the_border():
+    starts = tile_starts(1000, 400, 0.25)
+
+    assert starts == [0, 300, 600]
+    assert starts[-1] + 400 == 1000
+
+
+def test_tile_starts_single_tile_when_image_fits():
+    assert tile_starts(300, 640, 0.2) == [0]
+    assert tile_starts(640, 640, 0.2) == [0]
+
+
+def test_tile_image_returns_views_with_offsets():
+    image = np.zeros((500, 800, 3), np.uint8)
+
+    tiles = tile_image(image, 400, 0.5)
+
+    assert [offset for _, offset in tiles] == [
+        (0, 0),
+        (200, 0),
+        (400, 0),
+        (0, 100),
+        (200, 100),
+        (400, 100),
+    ]
+    assert all(tile.shape == (400, 400, 3) for tile, _ in tiles)
+    assert all(np.shares_memory(tile, image) for tile, _ in tiles)
+
+
+def test_suppress_drops_overlapping_boxes_of_the_same_class():
+    data = detections(
+        [10, 10, 110, 50, 0.6, 0],
+        [12, 11, 112, 51, 0.9, 0],
+    )
+
+    assert suppress(data) == [1]
+
+
+def test_suppress_drops_plate_cut_by_the_tile_border():
+    # La mitad de la matrícula que quedó en otra ventana: IoU bajo, pero
+    # contenida en la detección completa
+    data = detections(
+        [100, 100, 200, 140, 0.9, 0],
+        [100, 100, 140, 140, 0.7, 0],
+    )
+
+    assert suppress(data) == [0]
+
+
+def test_suppress_keeps_other_classes_and_separate_boxes():
+    data = detections(
+        [100, 100, 200, 140, 0.9, 0],
+        [100, 100, 200, 140, 0.8, 1],
+        [400, 100, 500, 140, 0.7, 0],
+    )
+
+    assert suppress(data) == [0, 1, 2]
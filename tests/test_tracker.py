@@ -0,0 +1,99 @@
+from plate_cli.utils.tracker import PlateTracker, Track, centroid_distance, iou
+
+
+def test_iou():
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert iou((0, 0, 10, 10), (5, 0, 15, 10)) == 50 / 150
+    assert iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+
+
+def test_centroid_distance_is_relative_to_the_diagonal():
+    assert centroid_distance((0, 0, 30, 40), (25, 0, 55, 40)) == 0.5
+
+
+def test_update_keeps_the_track_of_a_moving_plate():
+    tracker = PlateTracker()
+
+    first = tracker.update([((100, 100, 200, 140), "chile", 0.8)])
+    second = tracker.update([((105, 102, 205, 142), "chile", 0.9)])
+
+    assert second[0] is first[0]
+    assert second[0].bbox == (105, 102, 205, 142)
+    assert second[0].confidence == 0.9
+
+
+def test_update_matches_by_distance_when_iou_is_not_enough():
+    tracker = PlateTracker(max_distance=0.5)
+
+    first = tracker.update([((100, 100, 200, 140), "chile", 0.8)])
+    # Poco solapamiento, pero a menos de media diagonal
+    second = tracker.update([((145, 120, 245, 160), "chile", 0.8)])
+
+    assert iou((100, 100, 200, 140), (145, 120, 245, 160)) < tracker.iou_threshold
+    assert second[0] is first[0]
+
+
+def test_update_assigns_each_box_to_the_best_track():
+    tracker = PlateTracker()
+    left, right = tracker.update(
+        [((0, 0, 100, 40), "chile", 0.8), ((500, 0, 600, 40), "peru", 0.8)]
+    )
+
+    # Mismo frame con el orden de las cajas invertido
+    tracks = tracker.update(
+        [((502, 1, 602, 41), "peru", 0.8), ((3, 1, 103, 41), "chile", 0.8)]
+    )
+
+    assert tracks == [right, left]
+
+
+def test_update_creates_a_track_for_a_distant_box():
+    tracker = PlateTracker()
+
+    first = tracker.update([((0, 0, 100, 40), "chile", 0.8)])
+    second = tracker.update([((800, 600, 900, 640), "chile", 0.8)])
+
+    assert second[0].id != first[0].id
+    assert len(tracker.active) == 2
+
+
+def test_track_is_finished_after_max_missed_frames():
+    tracker = PlateTracker(max_missed=2)
+    (track,) = tracker.update([((0, 0, 100, 40), "chile", 0.8)])
+
+    for _ in range(3):
+        tracker.update([])
+
+    assert track.id not in tracker.active
+    assert list(tracker.finished) == [track]
+    assert tracker.tracks() == [track]
+
+
+def test_track_votes_for_the_most_common_reading_and_country():
+    track = Track(1, (0, 0, 100, 40), "chile", 0.8, frame=1)
+    track.countries["peru"] += 1
+    track.countries["peru"] += 1
+
+    for text in ("CZ9342", "CZ9347", "CZ9342", ""):
+        track.add_reading(text)
+
+    assert track.text == "CZ9342"
+    assert track.readings == 3
+    assert track.country == "peru"
+
+
+def test_needs_ocr_refines_until_max_readings():
+    tracker = PlateTracker(ocr_interval=2, max_readings=2)
+    (track,) = tracker.update([((0, 0, 100, 40), "chile", 0.8)])
+    assert tracker.needs_ocr(track)
+
+    track.last_ocr = tracker.frame
+    track.add_reading("CZ9342")
+    tracker.update([((0, 0, 100, 40), "chile", 0.8)])
+    assert not tracker.needs_ocr(track)
+
+    tracker.update([((0, 0, 100, 40), "chile", 0.8)])
+    assert tracker.needs_ocr(track)
+
+    track.add_reading("CZ9342")
+    assert not tracker.needs_ocr(track)
@@ -0,0 +1,118 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from plate_cli.writers import (
+    ROW_FIELDS,
+    CsvWriter,
+    JsonlWriter,
+    ResultWriter,
+    open_writer,
+    record_rows,
+    resolve_format,
+)
+
+RECORDS = [
+    {
+        "path": "chile_1.jpg",
+        "detections": [
+            {
+                "country": "chile",
+                "text": "CZ 93 42",
+                "confidence": 0.91,
+                "bbox": [650, 445, 790, 515],
+            },
+            {
+                "country": "chile",
+                "text": "RU 72 55",
+                "confidence": 0.84,
+                "bbox": [425, 405, 565, 450],
+            },
+        ],
+        "timings": {"inference_ms": 41.5, "ocr_ms": 12.0},
+    },
+    {"path": "vacia.jpg", "detections": [], "timings": {"inference_ms": 38.0}},
+    {"path": "rota.jpg", "error": "No se pudo leer la imagen"},
+]
+
+
+def test_record_rows_has_one_row_per_detection():
+    rows = record_rows(RECORDS[0])
+
+    assert [row["text"] for row in rows] == ["CZ 93 42", "RU 72 55"]
+    assert rows[0]["x_min"] == 650 and rows[0]["y_max"] == 515
+    assert all(row["inference_ms"] == 41.5 for row in rows)
+    assert all(tuple(row) == ROW_FIELDS for row in rows)
+
+
+def test_record_rows_keeps_images_without_detections():
+    (empty,) = record_rows(RECORDS[1])
+    (failed,) = record_rows(RECORDS[2])
+
+    assert empty["path"] == "vacia.jpg" and empty["text"] is None
+    assert empty["ocr_ms"] is None
+    assert failed["error"] == "No se pudo leer la imagen"
+
+
+def test_jsonl_writer(tmp_path):
+    path = tmp_path / "salida" / "results.jsonl"
+
+    with open_writer(path) as writer:
+        assert isinstance(writer, JsonlWriter)
+        for record in RECORDS:
+            writer.write(record)
+
+    rows = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    assert [row["path"] for row in rows] == [
+        "chile_1.jpg",
+        "chile_1.jpg",
+        "vacia.jpg",
+        "rota.jpg",
+    ]
+    assert rows[1]["confidence"] == 0.84
+
+
+def test_csv_writer(tmp_path):
+    path = tmp_path / "results.csv"
+
+    with open_writer(path) as writer:
+        assert isinstance(writer, CsvWriter)
+        for record in RECORDS:
+            writer.write(record)
+
+    with path.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == ROW_FIELDS
+    assert [row["text"] for row in rows] == ["CZ 93 42", "RU 72 55", "", ""]
+
+
+def test_parquet_writer_flushes_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from plate_cli.writers import ParquetWriter
+
+    path = tmp_path / "results.parquet"
+    with ParquetWriter(path, row_group=2) as writer:
+        for record in RECORDS:
+            writer.write(record)
+
+    table = pq.read_table(path)
+    assert table.column_names == list(ROW_FIELDS)
+    assert table.column("text").to_pylist() == ["CZ 93 42", "RU 72 55", None, None]
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+
+def test_resolve_format():
+    assert resolve_format(Path("results.csv")) == "csv"
+    assert resolve_format(Path("results.txt"), "jsonl") == "jsonl"
+
+    with pytest.raises(ValueError, match="no coincide"):
+        resolve_format(Path("results.csv"), "parquet")
+    with pytest.raises(ValueError, match="no soportado"):
+        resolve_format(Path("results.txt"))
+
+
+def test_result_writer_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        ResultWriter(tmp_path / "results")  # type: ignore[abstract]